@@ -1,40 +1,53 @@
-"""People detection primitives built on OpenCV HOG.
+"""People detection primitives built on OpenCV DNN with a HOG fallback.
 
 Why this design:
 - Encapsulate OpenCV configuration so UI can stay declarative.
 - Allow graceful degradation by guarding expensive dependencies.
 - Provide deterministic outputs (list of tuples) for downstream logic.
+- Prefer one MobileNet-SSD forward pass over a dense HOG pyramid when the
+  model files ship in models/, and fall back to HOG when they do not.
+- Detect on a background thread against the newest downscaled frame so the
+  UI loop never waits on HOG; callers reuse the last published result.
 """
 
 from __future__ import annotations
 
 import logging
-from typing import Iterable, List, Tuple
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 
 import cv2
 import numpy as np
 
+from ..utils.resources import find_resource
+
 # From raw data to real impact.
 
 LOGGER = logging.getLogger("anomrecorder.detection")
 
 Detection = Tuple[Tuple[int, int, int, int], float]
 
+DETECT_MAX_WIDTH = 640
+
+SSD_PROTOTXT = "models/MobileNetSSD_deploy.prototxt"
+SSD_WEIGHTS = "models/MobileNetSSD_deploy.caffemodel"
+SSD_PERSON_CLASS = 15
+SSD_MIN_CONFIDENCE = 0.5
+
 
-def _sigmoid(x: float) -> float:
-    try:
-        return 1.0 / (1.0 + np.exp(-float(x)))
-    except Exception:  # pragma: no cover - numpy failure would be critical
-        LOGGER.exception("sigmoid failed", extra={"value": x})
-        return 0.5
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    """Map raw HOG scores to 0..1 confidences in one vectorized pass."""
+    with np.errstate(over="ignore"):  # exp overflow saturates to 0.0, which is correct
+        return np.clip(1.0 / (1.0 + np.exp(-np.asarray(x, dtype=np.float64))), 0.0, 1.0)
 
 
 class PersonDetector:
     """Thin wrapper around OpenCV's default people detector."""
 
-    def __init__(self) -> None:
+    def __init__(self, win_stride: Tuple[int, int] = (8, 8)) -> None:
         self._hog = cv2.HOGDescriptor()
         self._hog.setSVMDetector(cv2.HOGDescriptor_getDefaultPeopleDetector())
+        self._win_stride = win_stride
 
     def detect(self, frame_bgr: np.ndarray) -> List[Detection]:
         if frame_bgr is None or not isinstance(frame_bgr, np.ndarray):
@@ -44,16 +57,147 @@ class PersonDetector:
         rects, weights = self._hog.detectMultiScale(
             gray,
             hitThreshold=0,
-            winStride=(8, 8),
+            winStride=self._win_stride,
             padding=(8, 8),
             scale=1.05,
         )
-        weights_seq: Iterable[float] = weights.flatten().tolist() if isinstance(weights, np.ndarray) else weights or []
+        confs = _sigmoid(np.asarray(weights if weights is not None else [], dtype=np.float64).ravel()).tolist()
+        return [((int(x), int(y), int(w), int(h)), conf) for (x, y, w, h), conf in zip(rects, confs)]
+
+
+class DnnPersonDetector:
+    """MobileNet-SSD person detector with the same output as PersonDetector."""
+
+    def __init__(self, net: "cv2.dnn.Net", min_confidence: float = SSD_MIN_CONFIDENCE) -> None:
+        self._net = net
+        self._min_confidence = min_confidence
+
+    @classmethod
+    def from_files(cls, prototxt: str, weights: str) -> "DnnPersonDetector":
+        net = cv2.dnn.readNetFromCaffe(prototxt, weights)
+        net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+        net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+        return cls(net)
+
+    def detect(self, frame_bgr: np.ndarray) -> List[Detection]:
+        if frame_bgr is None or not isinstance(frame_bgr, np.ndarray):
+            LOGGER.warning("detect called with invalid frame")
+            return []
+        h, w = frame_bgr.shape[:2]
+        blob = cv2.dnn.blobFromImage(frame_bgr, 0.007843, (300, 300), 127.5)
+        self._net.setInput(blob)
+        rows = self._net.forward().reshape(-1, 7)
+        keep = (rows[:, 1] == SSD_PERSON_CLASS) & (rows[:, 2] >= self._min_confidence)
         detections: List[Detection] = []
-        for (x, y, w, h), score in zip(rects, weights_seq):
-            conf = float(np.clip(_sigmoid(score), 0.0, 1.0))
-            detections.append(((int(x), int(y), int(w), int(h)), conf))
+        for _, _, conf, x1, y1, x2, y2 in rows[keep]:
+            left = int(np.clip(x1, 0.0, 1.0) * w)
+            top = int(np.clip(y1, 0.0, 1.0) * h)
+            right = int(np.clip(x2, 0.0, 1.0) * w)
+            bottom = int(np.clip(y2, 0.0, 1.0) * h)
+            if right <= left or bottom <= top:
+                continue
+            detections.append(((left, top, right - left, bottom - top), float(conf)))
         return detections
 
 
-__all__ = ["PersonDetector", "Detection"]
+def create_person_detector() -> "PersonDetector | DnnPersonDetector":
+    """Return the DNN detector when its model files are bundled, else HOG."""
+    prototxt = find_resource(SSD_PROTOTXT)
+    weights = find_resource(SSD_WEIGHTS)
+    if prototxt and weights:
+        try:
+            return DnnPersonDetector.from_files(prototxt, weights)
+        except cv2.error:
+            LOGGER.warning("dnn detector unavailable, using HOG", exc_info=True)
+    return PersonDetector(win_stride=(16, 16))
+
+
+class AsyncPersonDetector:
+    """Run a detector on a worker thread with a one-frame mailbox per slot.
+
+    ``submit`` replaces any frame still waiting for that slot, so a slow
+    detector only ever sees the newest frame. ``latest`` returns the last
+    published detections in the caller's frame coordinates.
+    """
+
+    def __init__(self, detector: Optional[Any] = None, max_width: int = DETECT_MAX_WIDTH) -> None:
+        self._detector = detector if detector is not None else create_person_detector()
+        self._max_width = max_width
+        self._cond = threading.Condition()
+        self._pending: Dict[int, Tuple[np.ndarray, float]] = {}
+        self._results: Dict[int, List[Detection]] = {}
+        self._generation: Dict[int, int] = {}
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="anomrecorder-detect", daemon=True)
+        self._thread.start()
+
+    def submit(self, slot: int, frame_bgr: np.ndarray) -> None:
+        width = frame_bgr.shape[1]
+        if width > self._max_width:
+            scale = self._max_width / float(width)
+            height = max(1, int(round(frame_bgr.shape[0] * scale)))
+            small = cv2.resize(frame_bgr, (self._max_width, height), interpolation=cv2.INTER_AREA)
+        else:
+            scale = 1.0
+            small = frame_bgr.copy()  # The caller keeps drawing on its frame
+        with self._cond:
+            if self._closed:
+                return
+            self._pending[slot] = (small, scale)
+            self._cond.notify()
+
+    def latest(self, slot: int) -> List[Detection]:
+        with self._cond:
+            return self._results.get(slot, [])
+
+    def clear(self, slot: int) -> None:
+        with self._cond:
+            self._pending.pop(slot, None)
+            self._results.pop(slot, None)
+            # Drop the result of a detection already in flight for this slot
+            self._generation[slot] = self._generation.get(slot, 0) + 1
+
+    def close(self, timeout: float = 2.0) -> None:
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        last_slot = -1
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # Round-robin over slots so one busy camera cannot starve the other
+                waiting = sorted(self._pending)
+                slot = next((s for s in waiting if s > last_slot), waiting[0])
+                last_slot = slot
+                small, scale = self._pending.pop(slot)
+                generation = self._generation.get(slot, 0)
+            try:
+                found = self._detector.detect(small)
+            except Exception:
+                LOGGER.exception("async detect failed", extra={"slot": slot})
+                found = []
+            if scale != 1.0:
+                inv = 1.0 / scale
+                found = [
+                    ((int(x * inv), int(y * inv), int(w * inv), int(h * inv)), conf)
+                    for (x, y, w, h), conf in found
+                ]
+            with self._cond:
+                if generation == self._generation.get(slot, 0):
+                    self._results[slot] = found
+
+
+__all__ = [
+    "PersonDetector",
+    "DnnPersonDetector",
+    "AsyncPersonDetector",
+    "create_person_detector",
+    "Detection",
+]
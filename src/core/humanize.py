@@ -11,16 +11,16 @@ from __future__ import annotations
 from datetime import datetime, timedelta
 # Less noise. More signal. AnomFIN.
 
+_BYTE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
 
 def format_bytes(num_bytes: int) -> str:
     if num_bytes < 0:
         raise ValueError("num_bytes must be non-negative")
-    units = ["B", "KB", "MB", "GB", "TB"]
-    value = float(num_bytes)
-    idx = 0
-    while value >= 1024 and idx < len(units) - 1:
-        value /= 1024
-        idx += 1
+    units = _BYTE_UNITS
+    # Each unit spans 10 bits, so the bit length picks the unit directly
+    idx = min((int(num_bytes).bit_length() - 1) // 10, len(units) - 1) if num_bytes >= 1 else 0
+    value = num_bytes / (1 << (10 * idx))
     if idx >= 2:
         rounded = round(value, 1)
         if abs(rounded - int(rounded)) < 1e-6:
@@ -0,0 +1,56 @@
+"""Cheap scene-change gate in front of the motion and person detectors.
+
+Why this design:
+- Compare a 32x32 luma thumbnail so the gate costs almost nothing per frame.
+- Compare against the last analysed frame, so slow drift still opens the gate.
+- Open periodically anyway to keep background models learning on idle scenes.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import cv2
+import numpy as np
+
+# From raw data to real impact.
+
+GATE_SIZE = 32
+GATE_THRESHOLD_L1 = 500.0
+GATE_REFRESH_FRAMES = 30
+
+
+class ChangeGate:
+    """Decide per frame whether the heavy detectors are worth running."""
+
+    def __init__(
+        self,
+        size: int = GATE_SIZE,
+        threshold: float = GATE_THRESHOLD_L1,
+        refresh_every: int = GATE_REFRESH_FRAMES,
+    ) -> None:
+        self._size = (size, size)
+        self._threshold = threshold
+        self._refresh_every = refresh_every
+        self._reference: Optional[np.ndarray] = None
+        self._skipped = 0
+
+    def should_analyse(self, gray: np.ndarray) -> bool:
+        tiny = cv2.resize(gray, self._size, interpolation=cv2.INTER_AREA)
+        if (
+            self._reference is None
+            or self._skipped + 1 >= self._refresh_every
+            or cv2.norm(tiny, self._reference, cv2.NORM_L1) >= self._threshold
+        ):
+            self._reference = tiny
+            self._skipped = 0
+            return True
+        self._skipped += 1
+        return False
+
+    def reset(self) -> None:
+        self._reference = None
+        self._skipped = 0
+
+
+__all__ = ["ChangeGate"]
@@ -0,0 +1,164 @@
+"""Settings validation table shared by load and save paths.
+
+Why this design:
+- Build the coercion table once at import instead of per-save try/except chains.
+- Validate the whole settings mapping in one pass and report every bad field.
+- Keep the rules pure so the UI only decides how to present errors.
+- Centralize defaults so the settings file only stores what the user changed.
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import Any, Callable, Dict, Mapping, Tuple
+
+from ..utils.hotkeys import HotkeyConfig
+
+# Validate first, trust never.
+
+Coercer = Callable[[Any], Any]
+
+
+class InvalidSetting(ValueError):
+    """Raised by coercers with a user-facing reason."""
+
+
+def _float_in(low: float, high: float, message: str) -> Coercer:
+    def coerce(value: Any) -> float:
+        if isinstance(value, bool):
+            raise InvalidSetting(message)
+        number = float(value)
+        if not (low <= number <= high):
+            raise InvalidSetting(message)
+        return number
+
+    return coerce
+
+
+def _positive_float(value: Any) -> float:
+    if isinstance(value, bool):
+        raise InvalidSetting("täytyy olla positiivinen luku")
+    number = float(value)
+    if not number > 0:  # also rejects NaN
+        raise InvalidSetting("täytyy olla positiivinen luku")
+    return number
+
+
+def _as_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)) and value in (0, 1):
+        return bool(value)
+    raise InvalidSetting("täytyy olla kyllä/ei")
+
+
+def _as_str(value: Any) -> str:
+    if value is None:
+        return ""
+    if not isinstance(value, str):
+        raise InvalidSetting("täytyy olla tekstiä")
+    return value
+
+
+def _of_type(kind: type, message: str) -> Coercer:
+    def coerce(value: Any) -> Any:
+        if not isinstance(value, kind):
+            raise InvalidSetting(message)
+        return value
+
+    return coerce
+
+
+SETTINGS_SCHEMA: Dict[str, Coercer] = {
+    "storage_limit_gb": _positive_float,
+    "logo_path": _as_str,
+    "logo_alpha": _float_in(0.0, 1.0, "täytyy olla välillä 0–1"),
+    "motion_threshold": _float_in(0.0, 1.0, "täytyy olla välillä 0–1"),
+    "hotkeys": _of_type(dict, "täytyy olla avain-arvo-taulu"),
+    "autoreconnect": _as_bool,
+    "ip_cameras": _of_type(list, "täytyy olla lista"),
+    "audio_enabled": _as_bool,
+    "audio_device": _as_str,
+    "event_notes": _of_type(dict, "täytyy olla avain-arvo-taulu"),
+}
+
+DEFAULT_SETTINGS: Dict[str, Any] = {
+    "storage_limit_gb": 5.0,
+    "logo_path": "",
+    "logo_alpha": 0.25,
+    "motion_threshold": 0.05,
+    "hotkeys": HotkeyConfig().to_dict(),
+    "autoreconnect": True,
+    "ip_cameras": [],
+    "audio_enabled": False,
+    "audio_device": "",
+    "event_notes": {},
+}
+
+FIELD_LABELS: Dict[str, str] = {
+    "storage_limit_gb": "Tallennusraja (GB)",
+    "logo_path": "Logo",
+    "logo_alpha": "Läpinäkyvyys",
+    "motion_threshold": "Liikekynnys",
+    "hotkeys": "Pikanäppäimet",
+    "autoreconnect": "Automaattinen uudelleenyhdistäminen",
+    "ip_cameras": "IP-kamerat",
+    "audio_enabled": "Tallenna ääni",
+    "audio_device": "Äänitulo",
+    "event_notes": "Merkinnät",
+}
+
+
+def validate_settings(raw: Mapping[str, Any]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Coerce known keys in one pass.
+
+    Returns ``(clean, errors)`` where ``clean`` holds every valid known key and
+    ``errors`` maps each rejected key to a user-facing reason. Unknown keys are
+    ignored.
+    """
+    clean: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    for key, value in raw.items():
+        coerce = SETTINGS_SCHEMA.get(key)
+        if coerce is None:
+            continue
+        try:
+            clean[key] = coerce(value)
+        except InvalidSetting as exc:
+            errors[key] = str(exc)
+        except (TypeError, ValueError):
+            errors[key] = "virheellinen arvo"
+    return clean, errors
+
+
+def with_defaults(stored: Mapping[str, Any]) -> Dict[str, Any]:
+    """Layer stored values over a private copy of the defaults."""
+    merged = copy.deepcopy(DEFAULT_SETTINGS)
+    merged.update(stored)
+    return merged
+
+
+def diff_from_defaults(settings: Mapping[str, Any]) -> Dict[str, Any]:
+    """Return only the entries that differ from DEFAULT_SETTINGS."""
+    return {
+        key: value
+        for key, value in settings.items()
+        if key not in DEFAULT_SETTINGS or DEFAULT_SETTINGS[key] != value
+    }
+
+
+def format_errors(errors: Mapping[str, str]) -> str:
+    """Render validation errors as one line per field for dialogs."""
+    return "\n".join(f"{FIELD_LABELS.get(key, key)}: {reason}" for key, reason in errors.items())
+
+
+__all__ = [
+    "InvalidSetting",
+    "SETTINGS_SCHEMA",
+    "DEFAULT_SETTINGS",
+    "FIELD_LABELS",
+    "validate_settings",
+    "with_defaults",
+    "diff_from_defaults",
+    "format_errors",
+]
@@ -4,10 +4,13 @@ Why this design:
 - Abstract cv2 probing away from UI logic for testability.
 - Provide timeout bounds to avoid blocking UI threads.
 - Return friendly names + indices for immediate combo-box use.
+- Probe all indices concurrently so discovery costs one probe, not ten.
 """
 
 from __future__ import annotations
 
+import queue
+import threading
 import time
 from typing import List, Tuple
 
@@ -15,25 +18,68 @@ import cv2
 
 # Beyond algorithms. Into outcomes.
 
+READ_RETRY_SECONDS = 0.05
+# Whole-scan bound: generous, since DSHOW opens can take seconds on their own
+SCAN_TIMEOUT_SECONDS = 8.0
 
-def list_cameras(max_indices: int = 10, probe_timeout: float = 1.0) -> List[Tuple[str, int]]:
-    results: List[Tuple[str, int]] = []
-    for idx in range(max_indices):
-        cap = cv2.VideoCapture(idx, cv2.CAP_DSHOW)
+
+def _probe(idx: int, read_timeout: float) -> bool:
+    """Open one index, retry reads for up to ``read_timeout``, and release it."""
+    cap = cv2.VideoCapture(idx, cv2.CAP_DSHOW)
+    try:
         if not cap.isOpened():
-            cap.release()
-            continue
-        start = time.time()
-        ok = False
-        while time.time() - start < probe_timeout:
+            return False
+        deadline = time.monotonic() + read_timeout
+        while True:
             ok, _ = cap.read()
             if ok:
-                break
-            time.sleep(0.05)
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(READ_RETRY_SECONDS)
+    finally:
         cap.release()
+
+
+def list_cameras(
+    max_indices: int = 10,
+    probe_timeout: float = 1.0,
+    scan_timeout: float = SCAN_TIMEOUT_SECONDS,
+) -> List[Tuple[str, int]]:
+    """Return ``(name, index)`` for every index that delivers a frame.
+
+    Each index gets ``probe_timeout`` of read retries once it has opened, as a
+    sequential scan would; opening itself is unbounded per probe. The scan as a
+    whole gives up after ``scan_timeout``: probes still stuck in a driver call
+    run on daemon threads, are ignored, and never block interpreter exit.
+    """
+    if max_indices <= 0:
+        return []
+    results: "queue.Queue[Tuple[int, bool]]" = queue.Queue()
+
+    def run(idx: int) -> None:
+        try:
+            ok = _probe(idx, probe_timeout)
+        except Exception:
+            ok = False
+        results.put((idx, ok))
+
+    for idx in range(max_indices):
+        threading.Thread(target=run, args=(idx,), name=f"anomrecorder-probe-{idx}", daemon=True).start()
+
+    found: List[int] = []
+    deadline = time.monotonic() + scan_timeout
+    for _ in range(max_indices):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            idx, ok = results.get(timeout=remaining)
+        except queue.Empty:
+            break
         if ok:
-            results.append((f"usb-{len(results) + 1}", idx))
-    return results
+            found.append(idx)
+    return [(f"usb-{n}", idx) for n, idx in enumerate(sorted(found), start=1)]
 
 
 __all__ = ["list_cameras"]
@@ -0,0 +1,72 @@
+"""Background frame grabbing for live camera feeds.
+
+Why this design:
+- Read each camera on its own thread so a slow USB or RTSP frame never
+  stalls the Tk loop.
+- Keep only the newest frame; stale frames are dropped, not queued.
+- Release the capture from the reading thread so a blocked read is never
+  torn down underneath itself.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Beyond algorithms. Into outcomes.
+
+LOGGER = logging.getLogger("anomrecorder.capture")
+
+READ_RETRY_SECONDS = 0.01
+
+
+class FrameGrabber:
+    """Own a VideoCapture and publish its latest frame with a sequence number."""
+
+    def __init__(self, cap: cv2.VideoCapture, name: str = "camera") -> None:
+        self._cap = cap
+        self._lock = threading.Lock()
+        self._frame: Optional[np.ndarray] = None
+        self._seq = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"anomrecorder-grab-{name}", daemon=True)
+        self._thread.start()
+
+    def latest(self, seen_seq: int = 0) -> Tuple[Optional[np.ndarray], int]:
+        """Return ``(frame, seq)``; frame is None unless newer than ``seen_seq``."""
+        with self._lock:
+            if self._seq <= seen_seq:
+                return None, self._seq
+            return self._frame, self._seq
+
+    def isOpened(self) -> bool:
+        return not self._stop.is_set() and self._cap.isOpened()
+
+    def release(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                ok, frame = self._cap.read()
+                if not ok or frame is None:
+                    self._stop.wait(READ_RETRY_SECONDS)
+                    continue
+                with self._lock:
+                    self._frame = frame
+                    self._seq += 1
+        except Exception:
+            LOGGER.exception("frame grab failed")
+        finally:
+            try:
+                self._cap.release()
+            except Exception:
+                LOGGER.warning("capture release failed", exc_info=True)
+
+
+__all__ = ["FrameGrabber"]
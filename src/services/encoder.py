@@ -0,0 +1,180 @@
+"""Hardware H.264 encoding through an ffmpeg subprocess.
+
+Why this design:
+- Probe ffmpeg once per process for a working NVENC / QSV / VAAPI encoder;
+  the answer never changes while the app runs.
+- Prove the encoder with a one-frame test encode, since ffmpeg lists encoders
+  it was built with even when the GPU or driver is missing.
+- Mirror the VideoWriter surface (isOpened/write/release) so the recorder's
+  writer thread drives either backend unchanged.
+- Stay optional: without ffmpeg or a usable encoder the recorder keeps MJPG.
+"""
+
+from __future__ import annotations
+
+import logging
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Beyond algorithms. Into outcomes.
+
+LOGGER = logging.getLogger("anomrecorder.encoder")
+
+PROBE_TIMEOUT_SECONDS = 10.0
+RELEASE_TIMEOUT_SECONDS = 10.0
+VAAPI_DEVICE = "/dev/dri/renderD128"
+
+# encoder -> (args before the input, args after it)
+HW_ENCODERS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "h264_nvenc": ((), ("-c:v", "h264_nvenc", "-preset", "p4")),
+    "h264_qsv": ((), ("-c:v", "h264_qsv")),
+    "h264_vaapi": (("-vaapi_device", VAAPI_DEVICE), ("-vf", "format=nv12,hwupload", "-c:v", "h264_vaapi")),
+}
+
+# Keep ffmpeg from flashing a console window on Windows
+_CREATION_FLAGS = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+_probe_lock = threading.Lock()
+_probe_done = False
+_probe_result: Optional[str] = None
+
+
+def _run(cmd: Sequence[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        list(cmd),
+        capture_output=True,
+        text=True,
+        timeout=PROBE_TIMEOUT_SECONDS,
+        creationflags=_CREATION_FLAGS,
+    )
+
+
+def _encoder_works(ffmpeg: str, encoder: str) -> bool:
+    pre, post = HW_ENCODERS[encoder]
+    cmd = [ffmpeg, "-hide_banner", "-loglevel", "error", *pre,
+           "-f", "lavfi", "-i", "color=size=256x144:rate=1", "-frames:v", "1",
+           *post, "-f", "null", "-"]
+    try:
+        return _run(cmd).returncode == 0
+    except (OSError, subprocess.SubprocessError):
+        return False
+
+
+def _probe(ffmpeg: Optional[str]) -> Optional[str]:
+    if ffmpeg is None:
+        return None
+    try:
+        listing = _run([ffmpeg, "-hide_banner", "-encoders"]).stdout
+    except (OSError, subprocess.SubprocessError):
+        LOGGER.warning("ffmpeg-encoder-probe-failed", exc_info=True)
+        return None
+    names = {line.split()[1] for line in listing.splitlines() if len(line.split()) > 1}
+    for encoder in HW_ENCODERS:
+        if encoder in names and _encoder_works(ffmpeg, encoder):
+            LOGGER.info("hw-encoder", extra={"encoder": encoder})
+            return encoder
+    return None
+
+
+def find_ffmpeg() -> Optional[str]:
+    return shutil.which("ffmpeg")
+
+
+def detect_hw_encoder(wait: bool = True) -> Optional[str]:
+    """Return the first working hardware H.264 encoder, probing only once.
+
+    With ``wait=False`` the call never blocks: until the probe has finished
+    (it is started in the background if nobody has) it returns None, so the
+    caller falls back to MJPG instead of waiting up to several ffmpeg timeouts.
+    """
+    global _probe_done, _probe_result
+    if not wait:
+        if _probe_done:
+            return _probe_result
+        if not _probe_lock.locked():
+            threading.Thread(target=detect_hw_encoder, name="anomrecorder-encoder-probe", daemon=True).start()
+        return None
+    with _probe_lock:
+        if not _probe_done:
+            _probe_result = _probe(find_ffmpeg())
+            _probe_done = True
+        return _probe_result
+
+
+def build_command(ffmpeg: str, path: Path, fps: float, size: Tuple[int, int], encoder: str) -> List[str]:
+    """ffmpeg argv that reads raw BGR frames from stdin and writes ``path``."""
+    width, height = size
+    pre, post = HW_ENCODERS[encoder]
+    return [
+        ffmpeg, "-hide_banner", "-loglevel", "error", "-y", *pre,
+        "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{width}x{height}", "-r", str(fps),
+        "-i", "pipe:0", *post,
+        # Fragmented MP4 stays playable if the app dies mid-recording
+        "-movflags", "+frag_keyframe+empty_moov",
+        str(path),
+    ]
+
+
+class FfmpegPipeWriter:
+    """VideoWriter-compatible sink that pipes raw frames into ffmpeg."""
+
+    def __init__(self, path: Path, fps: float, size: Tuple[int, int], encoder: str, ffmpeg: Optional[str] = None) -> None:
+        self.path = path
+        self._proc: Optional[subprocess.Popen] = None
+        exe = ffmpeg or find_ffmpeg()
+        if exe is None:
+            return
+        try:
+            self._proc = subprocess.Popen(
+                build_command(exe, path, fps, size, encoder),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                creationflags=_CREATION_FLAGS,
+            )
+        except OSError:
+            LOGGER.warning("ffmpeg-start-failed", extra={"path": str(path)}, exc_info=True)
+            self._proc = None
+
+    def isOpened(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None and self._proc.stdin is not None
+
+    def write(self, frame: np.ndarray) -> None:
+        if not self.isOpened():
+            return
+        try:
+            self._proc.stdin.write(np.ascontiguousarray(frame).data)
+        except (BrokenPipeError, ValueError, OSError):
+            LOGGER.warning("ffmpeg-pipe-closed", extra={"path": str(self.path)})
+            self._close_stdin()
+
+    def write_frames(self, frames: np.ndarray) -> None:
+        """Write a contiguous (n, h, w, 3) block of frames in one pipe write."""
+        self.write(frames)
+
+    def _close_stdin(self) -> None:
+        if self._proc is not None and self._proc.stdin is not None:
+            try:
+                self._proc.stdin.close()
+            except OSError:
+                pass
+
+    def release(self) -> None:
+        if self._proc is None:
+            return
+        self._close_stdin()
+        try:
+            self._proc.wait(timeout=RELEASE_TIMEOUT_SECONDS)
+        except subprocess.TimeoutExpired:
+            LOGGER.warning("ffmpeg-kill", extra={"path": str(self.path)})
+            self._proc.kill()
+            self._proc.wait()
+        self._proc = None
+
+
+__all__ = ["FfmpegPipeWriter", "HW_ENCODERS", "build_command", "detect_hw_encoder", "find_ffmpeg"]
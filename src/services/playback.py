@@ -0,0 +1,226 @@
+"""Background decoding for recording playback.
+
+Why this design:
+- Decode, resize and colour-convert on a worker thread so the Tk tick only
+  blits a ready frame.
+- Plan the resize once per (frame size, target size) pair; a file keeps its
+  resolution, so the per-frame work is a cache hit.
+- Fuse the BGR->RGB swap into an integer box downscale with numba when it
+  is installed (optional); otherwise exact 1/2 and 1/4 shrinks use pyrDown
+  and OpenCV's INTER_AREA covers the rest.
+- Hand frames over as binary PPM so Tk reads them straight into its photo
+  image, skipping the PIL round trip.
+- Bound the queue to two frames: decode stays just ahead of display and a
+  paused player holds almost no memory.
+- Block instead of dropping when the queue is full; a file has no newer frame
+  to skip to, so every decoded frame is shown in order.
+- Release the capture from the decoding thread so a read in progress is never
+  torn down underneath itself.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import queue
+import threading
+from typing import NamedTuple, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+try:  # Optional accelerator
+    from numba import njit  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    njit = None
+
+# Beyond algorithms. Into outcomes.
+
+LOGGER = logging.getLogger("anomrecorder.playback")
+
+PLAYBACK_QUEUE_SIZE = 2
+DEFAULT_TARGET_SIZE = (960, 540)
+_PUT_POLL_SECONDS = 0.05
+
+
+class PlaybackFrame(NamedTuple):
+    bgr: np.ndarray
+    ppm: bytes
+
+
+class _EndOfStream:
+    def __repr__(self) -> str:
+        return "EOF"
+
+
+EOF = _EndOfStream()
+
+
+def fit_size(width: int, height: int, avail_w: int, avail_h: int) -> Tuple[int, int]:
+    """Scale ``width``x``height`` down (never up) to fit the available area."""
+    scale = min(avail_w / width, avail_h / height, 1.0)
+    return max(1, int(width * scale)), max(1, int(height * scale))
+
+
+if njit is not None:
+
+    # Serial: it runs on the decoder and Tk threads while the live logo kernel
+    # runs on the frame workers, and numba's workqueue layer aborts on
+    # concurrent parallel regions. A playback-sized box filter needs no threads.
+    # nogil keeps the decode thread from stalling the Tk thread and frame workers.
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _bgr2rgb_area(src, dst, factor):  # pragma: no cover - needs numba
+        area = factor * factor
+        for y in range(dst.shape[0]):
+            for x in range(dst.shape[1]):
+                for c in range(3):
+                    total = 0
+                    for dy in range(factor):
+                        for dx in range(factor):
+                            total += src[y * factor + dy, x * factor + dx, 2 - c]
+                    dst[y, x, c] = (total + area // 2) // area
+
+else:
+    _bgr2rgb_area = None
+
+
+def warm_up_resize() -> None:
+    """Compile the JIT downscale ahead of the first playback frame; no-op without numba."""
+    if _bgr2rgb_area is None:
+        return
+    # Decoded frames and the output buffer are contiguous uint8, as here
+    _bgr2rgb_area(np.zeros((4, 4, 3), dtype=np.uint8), np.zeros((2, 2, 3), dtype=np.uint8), 2)
+
+
+class ResizePlan(NamedTuple):
+    size: Tuple[int, int]  # (width, height) after resizing
+    factor: int  # exact integer shrink, or 0 when the fit is fractional
+    pyr_levels: int  # pyrDown passes that land exactly on ``size``, or 0
+
+
+@functools.lru_cache(maxsize=16)
+def plan_resize(width: int, height: int, avail_w: int, avail_h: int) -> ResizePlan:
+    """Work out once how a ``width``x``height`` frame is fitted into the target."""
+    new_w, new_h = fit_size(width, height, avail_w, avail_h)
+    factor = width // new_w
+    if factor < 2 or new_w * factor != width or new_h * factor != height:
+        factor = 0
+    pyr_levels = {2: 1, 4: 2}.get(factor, 0)
+    return ResizePlan((new_w, new_h), factor, pyr_levels)
+
+
+def prepare_frame(
+    frame_bgr: np.ndarray,
+    target_size: Tuple[int, int],
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Resize a BGR frame into ``target_size`` and return it as RGB.
+
+    When the fit is an exact integer shrink and numba is available, one fused
+    pass writes into ``out`` (reused if its shape matches).
+    """
+    h, w = frame_bgr.shape[:2]
+    plan = plan_resize(w, h, *target_size)
+    new_w, new_h = plan.size
+    if _bgr2rgb_area is not None and plan.factor and frame_bgr.dtype == np.uint8 and frame_bgr.ndim == 3:
+        if out is None or out.shape != (new_h, new_w, 3):
+            out = np.empty((new_h, new_w, 3), dtype=np.uint8)
+        _bgr2rgb_area(frame_bgr, out, plan.factor)
+        return out
+    display = frame_bgr
+    if plan.pyr_levels:
+        for _ in range(plan.pyr_levels):
+            display = cv2.pyrDown(display)
+    elif (new_w, new_h) != (w, h):
+        display = cv2.resize(frame_bgr, (new_w, new_h), interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(display, cv2.COLOR_BGR2RGB)
+
+
+def to_ppm(frame_rgb: np.ndarray) -> bytes:
+    """Encode an RGB frame as binary PPM (P6) for ``tk.PhotoImage(data=...)``."""
+    h, w = frame_rgb.shape[:2]
+    # join copies straight from the array buffer: one copy instead of tobytes + concat
+    return b"".join((b"P6\n%d %d\n255\n" % (w, h), memoryview(np.ascontiguousarray(frame_rgb)).cast("B")))
+
+
+class PlaybackReader:
+    """Own a file VideoCapture and decode it ahead of the display."""
+
+    def __init__(
+        self,
+        cap: cv2.VideoCapture,
+        target_size: Tuple[int, int] = DEFAULT_TARGET_SIZE,
+        name: str = "playback",
+    ) -> None:
+        self._cap = cap
+        self._target_size = target_size
+        self._rgb: Optional[np.ndarray] = None  # reused; to_ppm copies out of it
+        self._queue: "queue.Queue[Union[PlaybackFrame, _EndOfStream]]" = queue.Queue(maxsize=PLAYBACK_QUEUE_SIZE)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"anomrecorder-{name}", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def open(cls, path: str, target_size: Tuple[int, int] = DEFAULT_TARGET_SIZE) -> Optional["PlaybackReader"]:
+        """Open ``path`` and start decoding; None when the file cannot be opened."""
+        cap = cv2.VideoCapture(path)
+        if not cap.isOpened():
+            cap.release()
+            return None
+        return cls(cap, target_size)
+
+    def set_target_size(self, width: int, height: int) -> None:
+        """Size used for frames decoded from now on (queued ones keep theirs)."""
+        self._target_size = (max(1, int(width)), max(1, int(height)))
+
+    def next_frame(self) -> Optional[Union[PlaybackFrame, _EndOfStream]]:
+        """Pop the next decoded frame, ``EOF`` at the end, or None if not ready yet."""
+        try:
+            return self._queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    def isOpened(self) -> bool:
+        return not self._stop.is_set()
+
+    def release(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        # Unblock a producer waiting on a full queue
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        if threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+
+    def _put(self, item: Union[PlaybackFrame, _EndOfStream]) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=_PUT_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                ok, frame = self._cap.read()
+                if not ok or frame is None:
+                    self._put(EOF)
+                    return
+                self._rgb = prepare_frame(frame, self._target_size, self._rgb)
+                if not self._put(PlaybackFrame(frame, to_ppm(self._rgb))):
+                    return
+        except Exception:
+            LOGGER.exception("playback decode failed")
+            self._put(EOF)
+        finally:
+            try:
+                self._cap.release()
+            except Exception:
+                LOGGER.warning("playback release failed", exc_info=True)
+
+
+__all__ = ["EOF", "PlaybackFrame", "PlaybackReader", "fit_size", "plan_resize", "prepare_frame", "to_ppm", "warm_up_resize", "PLAYBACK_QUEUE_SIZE"]
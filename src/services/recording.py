@@ -4,27 +4,78 @@ Why this design:
 - Maintain a circular prebuffer for contextual footage before triggers.
 - Expose dependency injection for VideoWriter to ease testing.
 - Keep IO at the edges while providing pure metadata return values.
+- Encode on a dedicated writer thread so capture never waits on the codec.
+- Prefer a hardware H.264 encoder via ffmpeg and fall back to MJPG, which
+  every OpenCV build can write.
+- Keep the prebuffer as preallocated arrays (frame ring plus timestamp
+  array) so every frame costs one memcpy and no Python allocations.
+- Pace live writes to target_fps so bursty drivers cannot make a file play
+  faster than real time.
+- Give the ring a writer queue's worth of spare slots and track which items
+  the writer has finished, so a slot is never reused while still queued.
+- Let a finished recording drain and release on its own thread; the event is
+  reported once the file is complete, so the caller never waits on the codec.
 """
 
 from __future__ import annotations
 
 import logging
+import queue
+import threading
 import time
-from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Deque, Dict, Optional, Tuple, Callable, Any
+from typing import Dict, List, Optional, Tuple, Callable, Any, Union
 
 import cv2
 import numpy as np
 
+from .encoder import FfmpegPipeWriter, detect_hw_encoder
+
 # AI you can deploy before lunch.
 
 LOGGER = logging.getLogger("anomrecorder.recording")
 
 WriterFactory = Callable[[Tuple[int, int]], cv2.VideoWriter]
 EventMeta = Dict[str, Any]
+# A single live frame, or the whole prebuffer as contiguous (n, h, w, 3) ring blocks
+WriterItem = Union[np.ndarray, List[np.ndarray]]
+
+# Seconds of footage the encoder may fall behind before live frames are dropped
+WRITER_QUEUE_SECONDS = 2
+# Seconds close() gives each writer to drain and release its file (ffmpeg alone may take 10)
+WRITER_CLOSE_TIMEOUT_SECONDS = 15.0
+_STOP_POLL_SECONDS = 0.1
+RECORDING_SUFFIXES = (".avi", ".mp4")
+
+
+@dataclass
+class _WriterJob:
+    """One recording's writer thread and the queue that feeds it."""
+
+    frames: "queue.Queue[Optional[Tuple[int, WriterItem]]]"
+    written_seq: int  # last item written; advanced by the writer thread
+    queued_seq: int  # last item queued
+    thread: Optional[threading.Thread] = None
+    finished: Optional[EventMeta] = None  # reported once the thread has exited
+
+    def send_stop(self, timeout: Optional[float] = None) -> bool:
+        """Queue the end-of-stream marker while the writer is alive to read it.
+
+        Gives up once the writer thread has died, since nothing would drain a
+        full queue then, or after ``timeout`` seconds. True if it was queued.
+        """
+        waited = 0.0
+        while self.thread is not None and self.thread.is_alive():
+            try:
+                self.frames.put(None, timeout=_STOP_POLL_SECONDS)
+                return True
+            except queue.Full:
+                waited += _STOP_POLL_SECONDS
+                if timeout is not None and waited >= timeout:
+                    break
+        return False
 
 
 @dataclass
@@ -37,24 +88,48 @@ class RecorderConfig:
 
 
 class RollingRecorder:
+    # Fallback codec when no hardware encoder is available; constant, so built once
+    _FOURCC = cv2.VideoWriter_fourcc(*"MJPG")
+
     def __init__(self, config: RecorderConfig, writer_factory: Optional[WriterFactory] = None) -> None:
         self.config = config
+        self._out_dir = Path(config.out_dir)
         self._writer_factory = writer_factory or self._default_writer_factory
-        self._prebuffer: Deque[Tuple[float, np.ndarray]] = deque(maxlen=int(config.pre_seconds * config.target_fps))
+        self._pre_len = max(1, int(config.pre_seconds * config.target_fps))
+        self._queue_len = max(1, int(config.target_fps * WRITER_QUEUE_SECONDS))
+        # Structure-of-arrays prebuffer; sized on the first frame
+        self._ring: Optional[np.ndarray] = None
+        self._pre_ts: Optional[np.ndarray] = None
+        self._slot_seq: Optional[np.ndarray] = None  # last writer item using each slot
+        self._pre_head = 0  # frames stored since the ring was built
+        self._enqueued_seq = 0
         self._writer: Optional[cv2.VideoWriter] = None
+        self._job: Optional[_WriterJob] = None
+        self._closing: List[_WriterJob] = []  # finished recordings still draining
         self._recording = False
         self._last_motion_ts: Optional[float] = None
         self._start_ts: Optional[float] = None
+        self._frames_written = 0  # live frames accepted since the recording began
         self._event_path: Optional[Path] = None
         self._persons_max = 0
-        self.config.out_dir.mkdir(parents=True, exist_ok=True)
+        self._out_dir.mkdir(parents=True, exist_ok=True)
 
     def _default_writer_factory(self, frame_size: Tuple[int, int]) -> cv2.VideoWriter:
         width, height = frame_size
-        fourcc = cv2.VideoWriter_fourcc(*"MJPG")
-        ts_name = datetime.now().strftime("%Y%m%d_%H%M%S")
-        path = self.config.out_dir / f"recording_cam{self.config.cam_slot}_{ts_name}.avi"
-        writer = cv2.VideoWriter(str(path), fourcc, self.config.target_fps, (width, height))
+        ts_name = time.strftime("%Y%m%d_%H%M%S")
+        stem = f"recording_cam{self.config.cam_slot}_{ts_name}"
+        # Never wait on the startup probe here: this runs on the frame worker
+        encoder = detect_hw_encoder(wait=False)
+        if encoder is not None:
+            path = self._out_dir / f"{stem}.mp4"
+            pipe = FfmpegPipeWriter(path, self.config.target_fps, frame_size, encoder)
+            if pipe.isOpened():
+                self._event_path = path
+                LOGGER.info("opened-writer", extra={"path": str(path), "encoder": encoder})
+                return pipe
+            pipe.release()
+        path = self._out_dir / f"{stem}.avi"
+        writer = cv2.VideoWriter(str(path), self._FOURCC, self.config.target_fps, (width, height))
         self._event_path = path
         LOGGER.info("opened-writer", extra={"path": str(path)})
         return writer
@@ -66,12 +141,143 @@ class RollingRecorder:
             raise RuntimeError("Failed to open video writer")
         return writer
 
-    def update(self, frame_bgr: np.ndarray, motion_trigger: bool, person_count: int) -> Tuple[Optional[EventMeta], Optional[EventMeta]]:
-        now = time.time()
-        self._prebuffer.append((now, frame_bgr.copy()))
+    def _start_writer_thread(self, writer: cv2.VideoWriter) -> None:
+        job = _WriterJob(queue.Queue(maxsize=self._queue_len), self._enqueued_seq, self._enqueued_seq)
+        job.thread = threading.Thread(target=self._writer_loop, args=(writer, job), daemon=True)
+        job.thread.start()
+        self._job = job
+
+    def _writer_loop(self, writer: cv2.VideoWriter, job: _WriterJob) -> None:
+        try:
+            while True:
+                entry = job.frames.get()
+                if entry is None:
+                    break
+                seq, item = entry
+                if isinstance(item, list):
+                    # Pipe writers take a whole block in one write; VideoWriter
+                    # only accepts single frames
+                    write_frames = getattr(writer, "write_frames", None)
+                    for block in item:
+                        if write_frames is not None:
+                            write_frames(block)
+                        else:
+                            for frame in block:
+                                writer.write(frame)
+                else:
+                    writer.write(item)
+                job.written_seq = seq
+        except Exception:
+            LOGGER.exception("writer-thread-failed")
+        finally:
+            try:
+                writer.release()
+            except Exception:
+                LOGGER.warning("writer-release-failed", exc_info=True)
+
+    def _enqueue(self, item: WriterItem, slots: Union[int, np.ndarray]) -> None:
+        """Queue ``item`` for the writer and mark ring ``slots`` as in use by it."""
+        if self._job is None or self._slot_seq is None:
+            return
+        seq = self._enqueued_seq + 1
+        try:
+            self._job.frames.put_nowait((seq, item))
+        except queue.Full:
+            # Prefer capture liveness over a complete file when the encoder lags.
+            LOGGER.debug("writer-queue-full", extra={"slot": self.config.cam_slot})
+            return
+        self._enqueued_seq = self._job.queued_seq = seq
+        self._slot_seq[slots] = seq
+
+    def _finish_writer(self, finished_event: EventMeta) -> None:
+        """Hand the active writer over to drain and release in the background."""
+        job = self._job
+        if job is None:
+            return
+        self._job = None
+        job.finished = finished_event
+        # The end-of-stream marker waits for room in a full queue; let a helper
+        # thread wait for it instead of the caller
+        threading.Thread(target=job.send_stop, daemon=True).start()
+        self._closing.append(job)
+
+    def _in_flight(self, seq: int) -> bool:
+        """Whether a live writer thread has still to write item ``seq``.
+
+        Each job owns its own range of items, so a new recording's slots free
+        up as it writes even while the previous file is still being released.
+        A dead writer has written (or abandoned) everything it was given.
+        """
+        jobs = self._closing + ([self._job] if self._job is not None else [])
+        return any(
+            job.written_seq < seq <= job.queued_seq and job.thread is not None and job.thread.is_alive()
+            for job in jobs
+        )
+
+    def poll_finished(self) -> Optional[EventMeta]:
+        """Return a finished recording whose file has been released, if any.
+
+        ``update`` calls this on every frame; callers that stop feeding frames
+        can call it directly so an event still gets reported.
+        """
+        for job in self._closing:
+            if job.thread is None or not job.thread.is_alive():
+                self._closing.remove(job)
+                return job.finished
+        return None
+
+    def _store(self, frame: np.ndarray, now: float) -> Optional[int]:
+        """Copy ``frame`` into the next ring slot; return the slot, or None if dropped.
+
+        The ring holds the prebuffer plus a writer queue's worth of spare
+        slots. A slot is only dropped if the writer has stalled for longer
+        than that, in which case the frame could not have been queued anyway.
+        """
+        if self._ring is None or self._ring.shape[1:] != frame.shape or self._ring.dtype != frame.dtype:
+            capacity = self._pre_len + self._queue_len
+            self._ring = np.empty((capacity,) + frame.shape, dtype=frame.dtype)
+            self._pre_ts = np.full(capacity, -np.inf)
+            self._slot_seq = np.zeros(capacity, dtype=np.int64)
+            self._pre_head = 0
+        slot = self._pre_head % len(self._ring)
+        if self._in_flight(int(self._slot_seq[slot])):
+            LOGGER.debug("ring-slot-busy", extra={"slot": self.config.cam_slot})
+            return None
+        np.copyto(self._ring[slot], frame)
+        self._pre_ts[slot] = now
+        self._pre_head += 1
+        return slot
+
+    def _prebuffer_slots(self) -> np.ndarray:
+        """Ring slots of the prebuffer, oldest first, excluding the newest frame."""
+        count = min(self._pre_head, self._pre_len) - 1
+        if count <= 0:
+            return np.empty(0, dtype=np.intp)
+        return np.arange(self._pre_head - 1 - count, self._pre_head - 1) % len(self._ring)
+
+    def _ring_blocks(self, slots: np.ndarray) -> List[np.ndarray]:
+        """Split consecutive ring slots into zero-copy views (at most two per wrap)."""
+        breaks = np.flatnonzero(np.diff(slots) != 1) + 1
+        return [self._ring[run[0]:run[-1] + 1] for run in np.split(slots, breaks)]
+
+    def update(
+        self,
+        frame_bgr: np.ndarray,
+        motion_trigger: bool,
+        person_count: int,
+        now: Optional[float] = None,
+    ) -> Tuple[Optional[EventMeta], Optional[EventMeta]]:
+        """Buffer one frame and advance the recording state.
+
+        ``now`` is a ``time.monotonic()`` reading, normally taken once per
+        capture tick by the caller; it drives prebuffer, pacing and post-roll
+        timing. Wall-clock time is only read at event boundaries.
+        """
+        if now is None:
+            now = time.monotonic()
+        slot = self._store(frame_bgr, now)
 
         new_event: Optional[EventMeta] = None
-        finished_event: Optional[EventMeta] = None
 
         if motion_trigger and not self._recording:
             try:
@@ -81,10 +287,16 @@ class RollingRecorder:
                 self._writer = None
                 self._recording = False
             else:
+                self._start_writer_thread(self._writer)
                 cutoff = now - self.config.pre_seconds
-                for ts, buffered_frame in list(self._prebuffer):
-                    if ts >= cutoff:
-                        self._writer.write(buffered_frame)
+                # One queue item for the whole prebuffer: the fresh queue always
+                # has room, so motion onset never waits on the encoder.
+                slots = self._prebuffer_slots()
+                # Slots come oldest first on a monotonic clock, so their
+                # timestamps are sorted and the cutoff is a binary search
+                slots = slots[np.searchsorted(self._pre_ts[slots], cutoff):]
+                if len(slots):
+                    self._enqueue(self._ring_blocks(slots), slots)
                 self._recording = True
                 self._start_ts = now
                 self._last_motion_ts = now
@@ -92,30 +304,53 @@ class RollingRecorder:
                 new_event = {"path": str(self._event_path), "start": datetime.now()}
 
         if self._recording and self._writer is not None:
-            self._writer.write(frame_bgr)
+            # Frame n of the file belongs at start + n / fps; skip frames that
+            # arrive more than half an interval early
+            interval = 1.0 / self.config.target_fps
+            due = (self._start_ts or now) + self._frames_written * interval
+            if slot is not None and now + 0.5 * interval >= due:
+                self._enqueue(self._ring[slot], slot)
+                self._frames_written += 1
             if motion_trigger:
                 self._last_motion_ts = now
                 self._persons_max = max(self._persons_max, person_count)
             if self._last_motion_ts is not None and (now - self._last_motion_ts) >= self.config.post_seconds:
-                try:
-                    self._writer.release()
-                except Exception:
-                    LOGGER.warning("writer-release-failed", exc_info=True)
-                duration = now - (self._start_ts or now)
-                finished_event = {
+                self._finish_writer({
                     "path": str(self._event_path),
                     "end": datetime.now(),
-                    "duration": duration,
+                    "duration": now - (self._start_ts or now),
                     "persons_max": self._persons_max,
-                }
+                })
                 self._recording = False
                 self._writer = None
                 self._last_motion_ts = None
                 self._start_ts = None
+                self._frames_written = 0
                 self._event_path = None
                 self._persons_max = 0
 
-        return new_event, finished_event
+        return new_event, self.poll_finished()
+
+    def close(self) -> None:
+        """Flush queued frames and wait, within a bound, for writers to release their files.
+
+        A writer that is still busy after WRITER_CLOSE_TIMEOUT_SECONDS is
+        logged and left to its daemon thread, so shutdown never hangs on it.
+        """
+        if self._job is not None:
+            self._job.send_stop(WRITER_CLOSE_TIMEOUT_SECONDS)
+            self._closing.append(self._job)
+            self._job = None
+        for job in self._closing:
+            if job.thread is None:
+                continue
+            job.thread.join(WRITER_CLOSE_TIMEOUT_SECONDS)
+            if job.thread.is_alive():
+                LOGGER.warning("writer-close-timeout", extra={"slot": self.config.cam_slot})
+        self._closing.clear()
+        self._writer = None
+        self._recording = False
+        self._frames_written = 0
 
 
-__all__ = ["RollingRecorder", "RecorderConfig"]
+__all__ = ["RollingRecorder", "RecorderConfig", "RECORDING_SUFFIXES"]
@@ -8,16 +8,19 @@ Why this design:
 
 from __future__ import annotations
 
+import concurrent.futures
 import json
 import logging
 import os
+import shutil
+import subprocess
 import sys
 import threading
 import time
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import cv2
 import numpy as np
@@ -25,19 +28,26 @@ import tkinter as tk
 from PIL import Image, ImageTk
 from tkinter import filedialog, messagebox, simpledialog, ttk
 
-from ..core.detection import PersonDetector
+from ..core.detection import AsyncPersonDetector
+from ..core.motion import ChangeGate
+from ..core.settings_schema import DEFAULT_SETTINGS, diff_from_defaults, format_errors, validate_settings, with_defaults
 from ..core.humanize import format_bytes, format_percentage, format_timestamp_relative
 from ..services.camera import list_cameras
+from ..services.capture import FrameGrabber
 from ..services.ip_camera import IPCamera
-from ..services.recording import RecorderConfig, RollingRecorder
+from ..services.playback import EOF, PlaybackReader, prepare_frame, to_ppm, warm_up_resize
+from ..services.encoder import detect_hw_encoder
+from ..services.recording import RECORDING_SUFFIXES, RecorderConfig, RollingRecorder
 from ..services.audio import AudioRecorder, AudioLevelMeter, list_input_devices, AudioUnavailableError
 from .theme import PALETTE, apply_dark_theme
 from .ip_camera_dialog import show_ip_camera_dialog
 from ..utils.resources import find_resource, find_user_logo_default
 from ..utils.zoom import ZoomState, crop_zoom
+from ..utils.overlay import LogoFit, blend_weighted, fit_logo, logo_weights, warm_up_blend
 from ..utils.hotkeys import HotkeyConfig
 from ..utils.reconnect import ReconnectState
 from ..utils.ffmpeg_opts import apply_rtsp_defaults
+from ..utils.atomic_write import write_json_atomic
 
 # Where code learns and brands scale.
 
@@ -45,6 +55,12 @@ LOGGER = logging.getLogger("anomrecorder.ui")
 
 UPDATE_INTERVAL_MS = 33
 PLAYBACK_BASE_INTERVAL = 1.0 / 30.0
+SNAPSHOT_JPEG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, 90, cv2.IMWRITE_JPEG_OPTIMIZE, 1]
+PIPELINE_MAX_WIDTH = 960  # Live view width; frames are downscaled to this once
+LOGO_CACHE_MAX = 8
+USAGE_RESYNC_SECONDS = 60.0  # Full rescan of the recordings folder to correct drift
+SAVE_DEBOUNCE_MS = 150
+SAVE_FLUSH_AFTER = 8  # Pending save requests that force an immediate flush
 
 
 @dataclass
@@ -59,7 +75,21 @@ class EventItem:
     note: str = ""
 
 
+@dataclass(frozen=True)
+class FrameOptions:
+    """Tk-variable values snapshotted on the Tk thread for one pipeline tick."""
+
+    motion: bool
+    motion_threshold: float
+    person: bool
+    logo_alpha: float
+    display: bool  # Live tab visible; otherwise only analysis and recording run
+    now: float  # time.monotonic() for this tick, shared by every slot
+
+
 class CameraApp:
+    LOGO_FILETYPES = (("Kuvat", "*.png;*.jpg;*.jpeg;*.bmp"), ("Kaikki", "*.*"))
+
     def __init__(self, root: tk.Tk) -> None:
         self.root = root
         self.root.title("AnomRecorder — AnomFIN")
@@ -99,12 +129,15 @@ class CameraApp:
         self.recording_indicators = [tk.StringVar(value="●"), tk.StringVar(value="●")]
         self.is_recording = [False, False]
         
-        self.caps: List[Optional[cv2.VideoCapture]] = [None, None]
+        self.caps: List[Optional[FrameGrabber]] = [None, None]
+        self._frame_seq = [0, 0]  # Last grabber frame processed per slot
         self.indices: List[Optional[int]] = [None, None]
         self.camera_sources: List[Optional[Union[str, int]]] = [None, None]  # Store either USB index or IP camera URL
         self.ip_cameras: List[IPCamera] = []  # Store configured IP cameras
         self.frame_imgs: List[Optional[ImageTk.PhotoImage]] = [None, None]
         self.last_frames_bgr: List[Optional[np.ndarray]] = [None, None]
+        self._snapshot_detections: List[List[Any]] = [[], []]  # Pipeline-space boxes drawn on wide snapshots
+        self._ts_cache: Tuple[int, str] = (0, "")  # (epoch second, formatted overlay timestamp)
         self.camera_list: List[Any] = []  # List of (name, source) tuples where source is USB index or IPCamera object
         
         # Reconnect states for each camera
@@ -126,41 +159,99 @@ class CameraApp:
         self.events: List[EventItem] = []
         self.event_counter = 0
 
-        self.storage_limit_gb = tk.DoubleVar(value=5.0)
-        self.motion_threshold = tk.DoubleVar(value=0.05)
-        self.logo_alpha = tk.DoubleVar(value=0.25)
+        self.storage_limit_gb = tk.DoubleVar(value=DEFAULT_SETTINGS["storage_limit_gb"])
+        self.motion_threshold = tk.DoubleVar(value=DEFAULT_SETTINGS["motion_threshold"])
+        self.logo_alpha = tk.DoubleVar(value=DEFAULT_SETTINGS["logo_alpha"])
         # Prefer user default logo under ~/downloads/logo.png (per request)
         self.logo_path: Optional[str] = find_user_logo_default() or find_resource("logo.png")
         self.logo_bgra: Optional[np.ndarray] = None
+        # (height, width, alpha) -> fitted logo and its opacity-scaled weights
+        self._logo_cache: Dict[Tuple[int, int, float], Tuple[Optional[LogoFit], Optional[np.ndarray]]] = {}
         self.logo_preview_img: Optional[ImageTk.PhotoImage] = None
         
         # Hotkeys
         self.hotkeys = HotkeyConfig()
 
-        self._detector = PersonDetector()
-        self._bgsubs = [cv2.createBackgroundSubtractorMOG2(history=300, varThreshold=16, detectShadows=True) for _ in range(2)]
+        self._detector = AsyncPersonDetector()
+        # Fed grayscale frames; shadow labelling is unused and costs extra work per pixel
+        # Skip MOG2 and detection on frames that match the last analysed one
+        self._change_gates = [ChangeGate() for _ in range(2)]
+        self._bgsubs = [cv2.createBackgroundSubtractorMOG2(history=300, varThreshold=16, detectShadows=False) for _ in range(2)]
 
         self.status_var = tk.StringVar(value="Valitse kamera listasta.")
         self.usage_label_var = tk.StringVar(value="Käyttöaste: 0%, 0 MB / 5 GB")
         self.motion_thresh_label_var = tk.StringVar(value="5 %")
         self.recording_indicator_var = tk.StringVar(value="● Ei tallenna")
 
-        self.playback_vc: Optional[cv2.VideoCapture] = None
+        # Decodes on its own thread; the Tk tick only blits what it has ready
+        self.playback_reader: Optional[PlaybackReader] = None
         self.playback_state = tk.StringVar(value="stopped")
         self.playback_speed = tk.DoubleVar(value=1.0)
         self.playback_path: Optional[str] = None
-        self.playback_img: Optional[ImageTk.PhotoImage] = None
+        self.playback_img: Optional[tk.PhotoImage] = None
         self.playback_last_frame_bgr: Optional[np.ndarray] = None
         self.playback_playlist: Optional[List[str]] = None
         self.playback_playlist_index: int = 0
-        self.playback_last_tick = time.time()
+        self.playback_last_tick = time.monotonic()
         
+        # Background pool for file encodes so libjpeg never blocks the Tk thread
+        self._io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="anomrecorder-io")
+        # Single worker keeps settings writes ordered while fsync runs off the Tk thread
+        self._settings_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="anomrecorder-settings")
+        # One worker per camera slot; OpenCV drops the GIL so slots run in parallel.
+        # Keep OpenCV's own threading off so the two slots don't oversubscribe cores.
+        # The setting is process-wide (OpenCV has no per-thread limit), so person
+        # detection, playback resizing and snapshot encodes also run single-
+        # threaded. That is the accepted trade-off: each of those already has its
+        # own thread, and the per-slot work is small operations on live-view-
+        # sized frames, where OpenCV's thread fan-out costs more than it saves.
+        cv2.setNumThreads(1)
+        self._frame_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="anomrecorder-frame")
+        self._logo_lock = threading.Lock()
+        # JIT-compile the logo blend and playback downscale off the Tk thread
+        # before the first frame needs them
+        self._io_pool.submit(warm_up_blend)
+        self._io_pool.submit(warm_up_resize)
+        # Probe ffmpeg hardware encoders once, before the first recording starts
+        self._io_pool.submit(detect_hw_encoder)
+
         # Refresh lock to prevent concurrent refreshes
         self._refresh_lock = threading.Lock()
 
         self._refreshing_cameras = False
+        self._usb_cameras: List[Tuple[str, int]] = []  # Last USB probe result
         self._toast_window: Optional[tk.Toplevel] = None
 
+        # Audio state
+        self.audio_enabled_var = tk.BooleanVar(value=DEFAULT_SETTINGS["audio_enabled"])
+        self.audio_device_var = tk.StringVar(value=DEFAULT_SETTINGS["audio_device"])
+        self._audio_recorder: Optional[AudioRecorder] = None
+        self._audio_recording_path: Optional[str] = None
+        self._audio_test_window: Optional[tk.Toplevel] = None
+        self._audio_meter: Optional[AudioLevelMeter] = None
+        self._audio_level_var = tk.DoubleVar(value=0.0)
+        # Event notes persistence map loaded from settings
+        self._notes_map: Dict[str, str] = {}
+
+        # Persisted Tk variables, snapshotted in one pass on save
+        self._tk_vars: Dict[str, tk.Variable] = {
+            "storage_limit_gb": self.storage_limit_gb,
+            "logo_alpha": self.logo_alpha,
+            "motion_threshold": self.motion_threshold,
+            "audio_enabled": self.audio_enabled_var,
+            "audio_device": self.audio_device_var,
+        }
+        self._last_saved_payload: Optional[Dict[str, Any]] = None
+        # Coalescing save: the latest payload wins, callbacks are batched
+        self._pending_save: Optional[Dict[str, Any]] = None
+        self._pending_save_callbacks: List[Callable[[Optional[BaseException]], None]] = []
+        self._pending_save_count = 0
+        self._save_timer: Optional[str] = None
+
+        # Running total of recordings folder size, rescanned every USAGE_RESYNC_SECONDS
+        self._usage_bytes = 0
+        self._usage_synced_at: Optional[float] = None
+
         self._load_settings()
         self.motion_thresh_label_var.set(f"{int(float(self.motion_threshold.get()) * 100)} %")
         self._build_layout()
@@ -178,16 +269,6 @@ class CameraApp:
         self._maybe_render_bg(0)
         self._maybe_render_bg(1)
 
-        # Audio state
-        self.audio_enabled_var = tk.BooleanVar(value=False)
-        self.audio_device_var = tk.StringVar(value="")
-        self._audio_recorder: Optional[AudioRecorder] = None
-        self._audio_recording_path: Optional[str] = None
-        self._audio_test_window: Optional[tk.Toplevel] = None
-        self._audio_meter: Optional[AudioLevelMeter] = None
-        self._audio_level_var = tk.DoubleVar(value=0.0)
-        # Event notes persistence map loaded from settings
-        self._notes_map: Dict[str, str] = {}
 
     # ------------------------------------------------------------------
     # UI construction
@@ -451,6 +532,7 @@ class CameraApp:
     
     def _update_camera_list(self, cams: List[Any]) -> None:
         """Update camera list in UI thread, including IP cameras."""
+        self._usb_cameras = list(cams)
         # Combine USB cameras and IP cameras
         combined_list = []
         
@@ -479,14 +561,12 @@ class CameraApp:
             self.status_var.set("Kameraa ei löydy. Kytke USB-kamera tai lisää IP-kamera.")
 
     def refresh_cameras(self) -> None:
-        """Refresh camera list without stopping active cameras."""
-        try:
-            cams = list_cameras()
-            # Use _update_camera_list to properly merge USB and IP cameras
-            self._update_camera_list(cams)
-        except Exception as e:
-            self.logger.error("refresh-cameras-failed", exc_info=True)
-            messagebox.showerror("Virhe", f"Kameroiden päivitys epäonnistui: {str(e)}")
+        """Refresh camera list without stopping active cameras.
+
+        Probing runs on a background thread; the combo boxes update once it
+        finishes.
+        """
+        self.refresh_cameras_async()
     
     def add_ip_camera(self) -> None:
         """Open dialog to add an IP/WiFi camera."""
@@ -497,9 +577,8 @@ class CameraApp:
                 self.ip_cameras.append(camera)
                 self.logger.info(f"Added IP camera: {camera.name} at {camera.ip}")
                 
-                # Refresh camera list to include new IP camera
-                cams = list_cameras()
-                self._update_camera_list(cams)
+                # Re-merge the last USB probe with the new IP camera; no re-probe needed
+                self._update_camera_list(self._usb_cameras)
                 
                 # Save IP cameras to config
                 self._save_ip_cameras()
@@ -550,9 +629,7 @@ class CameraApp:
                 self.indices[slot] = None
             else:
                 # USB camera
-                cap = cv2.VideoCapture(source, cv2.CAP_DSHOW)
-                cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+                cap = self._open_usb_capture(source)
                 self.camera_sources[slot] = source
                 self.indices[slot] = source
                 
@@ -586,12 +663,27 @@ class CameraApp:
                     messagebox.showwarning("Kamera", f"IP-kamerasta ei tule kuvaa. Tarkista URL/kirjautuminen.")
                     return
 
-            self.caps[slot] = cap
+            self._install_capture(slot, cap)
             self.status_var.set("Live-katselu käynnissä")
         except Exception as e:
             self.logger.error("start-camera-failed", exc_info=True)
             messagebox.showerror("Virhe", f"Kameran {slot + 1} käynnistys epäonnistui: {str(e)}")
 
+    @staticmethod
+    def _open_usb_capture(index: int) -> cv2.VideoCapture:
+        cap = cv2.VideoCapture(index, cv2.CAP_DSHOW)
+        # MJPG keeps 720p within USB bandwidth; set it before the frame size
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Avoid latency build-up in the driver queue
+        return cap
+
+    def _install_capture(self, slot: int, cap: cv2.VideoCapture) -> None:
+        """Hand an opened capture to a background grabber for the slot."""
+        self.caps[slot] = FrameGrabber(cap, name=f"slot{slot}")
+        self._frame_seq[slot] = 0
+
     def stop_camera(self, slot: int) -> None:
         if self.caps[slot] is not None:
             try:
@@ -600,6 +692,8 @@ class CameraApp:
                 self.logger.warning("cap-release-failed", exc_info=True)
         self.caps[slot] = None
         self.indices[slot] = None
+        self._detector.clear(slot)
+        self._change_gates[slot].reset()
         # Clear current frame and show background
         self.frame_imgs[slot] = None
         label = self.frame_label1 if slot == 0 else self.frame_label2
@@ -626,41 +720,39 @@ class CameraApp:
         for slot in range(2):
             self.is_recording[slot] = self.recorders[slot]._recording
         
-        labels = [self.frame_label1, self.frame_label2]
+        # Grabber threads keep the newest frame per camera; only take new ones
+        frames: Dict[int, np.ndarray] = {}
         for slot in range(2):
+            grabber = self.caps[slot]
+            if grabber is None or (slot == 1 and self.num_cams.get() == 1):
+                continue
+            frame, self._frame_seq[slot] = grabber.latest(self._frame_seq[slot])
+            if frame is not None:
+                frames[slot] = frame
+
+        opts = FrameOptions(
+            motion=bool(self.enable_motion.get()),
+            motion_threshold=float(self.motion_threshold.get()),
+            person=bool(self.enable_person.get()),
+            logo_alpha=float(self.logo_alpha.get()),
+            display=self.notebook.select() == str(self.live_tab),
+            now=time.monotonic(),
+        )
+        labels = [self.frame_label1, self.frame_label2]
+        if self.num_cams.get() == 1:
+            labels[1].configure(image="")
+            self.frame_imgs[1] = None
+        futures: Dict[int, concurrent.futures.Future] = {}
+        if len(frames) > 1:
+            futures = {slot: self._frame_pool.submit(self._process_slot, slot, frame, opts) for slot, frame in frames.items()}
+            concurrent.futures.wait(futures.values())
+        for slot, frame in frames.items():
             try:
-                label = labels[slot]
-                if slot == 1 and self.num_cams.get() == 1:
-                    label.configure(image="")
-                    self.frame_imgs[slot] = None
-                    continue
-                cap = self.caps[slot]
-                if cap is None:
-                    continue
-                ok, frame = cap.read()
-                if not ok:
-                    continue
-                self.last_frames_bgr[slot] = frame.copy()
-                detections = self._detector.detect(frame) if self.enable_person.get() else []
-                annotated = self._annotate(slot, frame, detections)
-                zoomed = crop_zoom(annotated, self.zoom_states[slot].factor, 
-                                  self.zoom_states[slot].pan_x, self.zoom_states[slot].pan_y)
-                display = cv2.resize(zoomed, (960, 540)) if zoomed.shape[1] > 960 else zoomed
-                frame_rgb = cv2.cvtColor(display, cv2.COLOR_BGR2RGB)
-                img = Image.fromarray(frame_rgb)
-                imgtk = ImageTk.PhotoImage(image=img)
-                self.frame_imgs[slot] = imgtk
-                label.configure(image=imgtk)
-
-                motion_trigger = False
-                if self.enable_motion.get():
-                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                    fg = self._bgsubs[slot].apply(gray)
-                    lvl = float((fg > 0).sum()) / float(fg.size)
-                    motion_trigger = lvl > float(self.motion_threshold.get())
-                person_count = len(detections)
-
-                new_event, finished_event = self.recorders[slot].update(annotated, motion_trigger, person_count)
+                result = futures[slot].result() if futures else self._process_slot(slot, frame, opts)
+                img, new_event, finished_event = result
+                # PhotoImage and widgets stay on the Tk thread
+                if img is not None:
+                    self._show_live_image(slot, labels[slot], img)
                 if new_event:
                     self._handle_new_event(new_event)
                 if finished_event:
@@ -669,22 +761,105 @@ class CameraApp:
                 self.logger.error("frame-update-failed", extra={"slot": slot}, exc_info=True)
                 # Don't show error dialog in update loop to avoid freezing UI or spamming user with multiple dialogs.
                 # Instead, just log the error and update status text for user visibility.
-                if slot == 0 or (slot == 1 and self.num_cams.get() == 2):
-                    self.status_var.set(f"Kamera {slot + 1}: virhe kuvan käsittelyssä")
-        
+                self.status_var.set(f"Kamera {slot + 1}: virhe kuvan käsittelyssä")
+        # A recording finishes in the background; report it even if its camera
+        # delivered no frame this tick
+        for slot, recorder in enumerate(self.recorders):
+            if slot not in frames:
+                finished_event = recorder.poll_finished()
+                if finished_event:
+                    self._handle_finished_event(finished_event)
+
         self.root.after(UPDATE_INTERVAL_MS, self.update_frames)
     
 
 
-    def _annotate(self, slot: int, frame_bgr: np.ndarray, detections: List[Any]) -> np.ndarray:
-        annotated = frame_bgr.copy()
+    def _show_live_image(self, slot: int, label: ttk.Label, img: Image.Image) -> None:
+        """Blit into the slot's PhotoImage, creating one only when the size changes."""
+        photo = self.frame_imgs[slot]
+        if photo is not None and (photo.width(), photo.height()) == img.size:
+            photo.paste(img)  # The label already shows this image; Tk redraws it
+            return
+        photo = ImageTk.PhotoImage(image=img)
+        self.frame_imgs[slot] = photo
+        label.configure(image=photo)
+
+    def _process_slot(
+        self, slot: int, frame: np.ndarray, opts: FrameOptions
+    ) -> Tuple[Optional[Image.Image], Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Analyse, annotate and record one captured frame.
+
+        Runs on a frame worker when both cameras are live, so it must not touch
+        Tk; returns the display image (None while the live tab is hidden) and
+        recorder events for the Tk thread.
+        """
+        # Snapshots keep the native resolution; everything else runs on
+        # one downscaled frame sized for the live view.
+        raw = frame
+        frame = self._downscale_for_pipeline(raw)
+
+        # Motion and detection must see the frame before any overlay is drawn
+        analyse = False
+        if opts.motion or opts.person:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            analyse = self._change_gates[slot].should_analyse(gray)
+        motion_trigger = opts.motion and analyse and self._motion_level(slot, gray) > opts.motion_threshold
+        if opts.person:
+            # Detection runs on its own thread; draw the last published result
+            if analyse:
+                self._detector.submit(slot, frame)
+            detections = self._detector.latest(slot)
+        else:
+            detections = []
+        # Overlays are part of the recording, so annotate even when hidden
+        annotated = self._annotate(slot, frame, detections, opts.logo_alpha)
+        img = None
+        if opts.display:
+            zoom = self.zoom_states[slot]
+            zoomed = crop_zoom(annotated, zoom.factor, zoom.pan_x, zoom.pan_y)
+            # PIL swaps BGR->RGB while unpacking, so no separate cvtColor pass
+            display = np.ascontiguousarray(zoomed)
+            img = Image.frombuffer("RGB", (display.shape[1], display.shape[0]), display, "raw", "BGR", 0, 1)
+        new_event, finished_event = self.recorders[slot].update(annotated, motion_trigger, len(detections), opts.now)
+        # Publish for snapshots only once drawing is done: a snapshot encoding on
+        # the IO pool then always sees a finished frame. Keep a reference to the
+        # native capture, never a copy; each read returns a fresh array that is
+        # not touched after this tick. Frames at live-view width were annotated
+        # in place; save_snapshot draws the same overlays onto wider ones.
+        self._snapshot_detections[slot] = detections
+        self.last_frames_bgr[slot] = raw
+        return img, new_event, finished_event
+
+    @staticmethod
+    def _downscale_for_pipeline(frame_bgr: np.ndarray) -> np.ndarray:
+        """Shrink wide frames to PIPELINE_MAX_WIDTH, preserving aspect ratio."""
+        h, w = frame_bgr.shape[:2]
+        if w <= PIPELINE_MAX_WIDTH:
+            return frame_bgr
+        new_h = max(1, int(round(h * PIPELINE_MAX_WIDTH / float(w))))
+        return cv2.resize(frame_bgr, (PIPELINE_MAX_WIDTH, new_h), interpolation=cv2.INTER_AREA)
+
+    def _motion_level(self, slot: int, gray: np.ndarray) -> float:
+        """Feed the slot's background model once and return the foreground ratio."""
+        fg = self._bgsubs[slot].apply(gray)
+        return cv2.countNonZero(fg) / float(fg.size)
+
+    def _overlay_timestamp(self) -> str:
+        """Return the overlay clock text, formatting only when the second rolls over."""
+        now = int(time.time())
+        if now != self._ts_cache[0]:
+            self._ts_cache = (now, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)))
+        return self._ts_cache[1]
+
+    def _annotate(self, slot: int, frame_bgr: np.ndarray, detections: List[Any], logo_alpha: float) -> np.ndarray:
+        """Draw detections, clock and logo onto frame_bgr in place and return it."""
+        annotated = frame_bgr
         for (x, y, w, h), conf in detections:
             color = (0, 255, 0) if conf >= 0.6 else (0, 180, 255)
             cv2.rectangle(annotated, (x, y), (x + w, y + h), color, 2)
             cv2.putText(annotated, f"Henkilö {int(conf * 100)}%", (x, max(0, y - 10)), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2, cv2.LINE_AA)
-        ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        cv2.putText(annotated, ts, (12, annotated.shape[0] - 12), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (230, 230, 230), 2, cv2.LINE_AA)
-        return self._overlay_logo(annotated)
+        cv2.putText(annotated, self._overlay_timestamp(), (12, annotated.shape[0] - 12), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (230, 230, 230), 2, cv2.LINE_AA)
+        return self._overlay_logo(annotated, logo_alpha)
 
     def _handle_new_event(self, data: Dict[str, Any]) -> None:
         self.event_counter += 1
@@ -727,6 +902,10 @@ class CameraApp:
                 event.duration = data.get("duration")
                 event.persons_max = data.get("persons_max", 0)
                 break
+        try:
+            self._usage_bytes += Path(data.get("path", "")).stat().st_size
+        except OSError:
+            self._usage_synced_at = None  # Unknown size; rescan on the next render
         self.refresh_events_view()
         self._update_usage_label()
         self.logger.info("event-end", extra={"path": data.get("path"), "duration": data.get("duration")})
@@ -743,15 +922,19 @@ class CameraApp:
     # Playback
     def _update_playback_if_needed(self) -> None:
         state = self.playback_state.get()
-        if not state.startswith("playing") or self.playback_vc is None:
+        if not state.startswith("playing") or self.playback_reader is None:
             return
-        now = time.time()
+        now = time.monotonic()
         interval = PLAYBACK_BASE_INTERVAL / max(0.1, float(self.playback_speed.get()))
         if now - self.playback_last_tick < interval:
             return
+        self.playback_reader.set_target_size(*self._playback_target_size())
+        item = self.playback_reader.next_frame()
+        if item is None:
+            # Decoder hasn't caught up yet; try again on the next tick
+            return
         self.playback_last_tick = now
-        ok, frame = self.playback_vc.read()
-        if not ok:
+        if item is EOF:
             # If playing a compilation, advance to next file
             if self.playback_playlist and (self.playback_playlist_index + 1) < len(self.playback_playlist):
                 self.playback_playlist_index += 1
@@ -759,19 +942,14 @@ class CameraApp:
                 if self._open_playback_path(next_path):
                     return
             # Otherwise stop
-            try:
-                self.playback_vc.release()
-            except Exception:
-                self.logger.warning("playback-release-failed", exc_info=True)
-            self.playback_vc = None
+            self._release_playback_reader()
             self.playback_state.set("stopped")
             self.playback_label.configure(image="")
             self.playback_img = None
             self.playback_last_frame_bgr = None
             return
-        # Render frame scaled to fit the available area
-        self.playback_last_frame_bgr = frame
-        self._render_playback_frame(frame)
+        self.playback_last_frame_bgr = item.bgr
+        self._show_playback_ppm(item.ppm)
 
     def _set_playback_speed(self, speed: float) -> None:
         self.playback_speed.set(max(0.1, min(4.0, speed)))
@@ -779,7 +957,7 @@ class CameraApp:
 
     def playback_play(self) -> None:
         try:
-            if self.playback_vc is None or not self.playback_vc.isOpened():
+            if self.playback_reader is None or not self.playback_reader.isOpened():
                 # If compilation is prepared, open current item
                 if self.playback_playlist is not None:
                     if len(self.playback_playlist) == 0:
@@ -805,13 +983,16 @@ class CameraApp:
         if self.playback_state.get().startswith("playing"):
             self.playback_state.set("paused")
 
-    def playback_stop(self) -> None:
-        if self.playback_vc is not None:
+    def _release_playback_reader(self) -> None:
+        if self.playback_reader is not None:
             try:
-                self.playback_vc.release()
+                self.playback_reader.release()
             except Exception:
                 self.logger.warning("playback-release-failed", exc_info=True)
-        self.playback_vc = None
+        self.playback_reader = None
+
+    def playback_stop(self) -> None:
+        self._release_playback_reader()
         self.playback_state.set("stopped")
         self.playback_label.configure(image="")
         self.playback_img = None
@@ -829,10 +1010,9 @@ class CameraApp:
         # Clear any active compilation when a specific file is selected
         self.playback_playlist = None
         self.playback_playlist_index = 0
-        self.playback_vc = cv2.VideoCapture(path)
-        if not self.playback_vc.isOpened():
+        self.playback_reader = PlaybackReader.open(path, self._playback_target_size())
+        if self.playback_reader is None:
             messagebox.showerror("Virhe", "Tallenteen avaaminen epäonnistui")
-            self.playback_vc = None
             return
         self.playback_state.set("paused")
         self.notebook.select(self.events_tab)
@@ -842,14 +1022,9 @@ class CameraApp:
     def _open_playback_path(self, path: str) -> bool:
         """Open a video file for playback. Returns True on success."""
         try:
-            if self.playback_vc is not None:
-                try:
-                    self.playback_vc.release()
-                except Exception:
-                    self.logger.warning("playback-release-failed", exc_info=True)
-            self.playback_vc = cv2.VideoCapture(path)
-            if not self.playback_vc.isOpened():
-                self.playback_vc = None
+            self._release_playback_reader()
+            self.playback_reader = PlaybackReader.open(path, self._playback_target_size())
+            if self.playback_reader is None:
                 return False
             self.playback_path = path
             self.playback_last_tick = 0.0
@@ -913,21 +1088,28 @@ class CameraApp:
             self.logger.error("compilation-selected-play-failed", exc_info=True)
             messagebox.showerror("Virhe", "Valittujen koosteen toisto epäonnistui")
 
+    def _playback_target_size(self) -> Tuple[int, int]:
+        avail_w = max(1, self.playback_label.winfo_width())
+        avail_h = max(1, self.playback_label.winfo_height())
+        if avail_w <= 1 or avail_h <= 1:
+            return 960, 540
+        return avail_w, avail_h
+
+    def _show_playback_ppm(self, ppm: bytes) -> None:
+        """Blit a PPM frame, rewriting the existing photo image in place."""
+        try:
+            if self.playback_img is None:
+                self.playback_img = tk.PhotoImage(data=ppm, format="PPM")
+                self.playback_label.configure(image=self.playback_img)
+            else:
+                self.playback_img.configure(data=ppm, format="PPM")
+        except Exception:
+            self.logger.error("render-playback-frame-failed", exc_info=True)
+
     def _render_playback_frame(self, frame_bgr: np.ndarray) -> None:
         """Render playback frame scaled to fit the playback label area."""
         try:
-            h, w = frame_bgr.shape[:2]
-            avail_w = max(1, self.playback_label.winfo_width())
-            avail_h = max(1, self.playback_label.winfo_height())
-            if avail_w <= 1 or avail_h <= 1:
-                avail_w, avail_h = 960, 540
-            scale = min(avail_w / w, avail_h / h, 1.0)
-            new_w, new_h = max(1, int(w * scale)), max(1, int(h * scale))
-            display = cv2.resize(frame_bgr, (new_w, new_h), interpolation=cv2.INTER_AREA)
-            frame_rgb = cv2.cvtColor(display, cv2.COLOR_BGR2RGB)
-            img = Image.fromarray(frame_rgb)
-            self.playback_img = ImageTk.PhotoImage(image=img)
-            self.playback_label.configure(image=self.playback_img)
+            self._show_playback_ppm(to_ppm(prepare_frame(frame_bgr, self._playback_target_size())))
         except Exception:
             self.logger.error("render-playback-frame-failed", exc_info=True)
 
@@ -982,9 +1164,8 @@ class CameraApp:
                     roi[..., c] = (alpha_resized * logo_resized[..., c] + (1.0 - alpha_resized) * roi[..., c]).astype(np.uint8)
                 bg[y:y+new_h, x:x+new_w] = roi
 
-            # Convert to Tk image
-            rgb = cv2.cvtColor(bg, cv2.COLOR_BGR2RGB)
-            im = Image.fromarray(rgb)
+            # Convert to Tk image; PIL unpacks BGR straight from the array buffer
+            im = Image.frombuffer("RGB", (avail_w, avail_h), bg, "raw", "BGR", 0, 1)
             tkimg = ImageTk.PhotoImage(image=im)
             label.configure(image=tkimg)
             # Keep reference to prevent GC
@@ -995,10 +1176,13 @@ class CameraApp:
 
     # ------------------------------------------------------------------
     # Recording list
+    def _recording_files(self) -> List[Path]:
+        return [p for p in self.record_dir.iterdir() if p.suffix in RECORDING_SUFFIXES and p.is_file()]
+
     def _load_existing_recordings(self) -> None:
         """Load existing recordings from disk on startup."""
         try:
-            existing_files = sorted(self.record_dir.glob("*.avi"), key=lambda p: p.stat().st_mtime, reverse=True)
+            existing_files = sorted(self._recording_files(), key=lambda p: p.stat().st_mtime, reverse=True)
             for file_path in existing_files:
                 # Skip if already loaded
                 if any(e.path == str(file_path) for e in self.events):
@@ -1060,7 +1244,7 @@ class CameraApp:
             existing_paths = {e.path for e in self.events}
             new_files = []
             
-            for file_path in self.record_dir.glob("*.avi"):
+            for file_path in self._recording_files():
                 if str(file_path) not in existing_paths:
                     new_files.append(file_path)
             
@@ -1096,7 +1280,7 @@ class CameraApp:
                         self.logger.warning("watch-add-failed", extra={"path": str(file_path)}, exc_info=True)
                 
                 self.refresh_events_view()
-                self._update_usage_label()
+                self._update_usage_label(resync=True)
         except Exception:
             pass
         
@@ -1170,7 +1354,7 @@ class CameraApp:
         
         if deleted_count > 0:
             self.refresh_events_view()
-            self._update_usage_label()
+            self._update_usage_label(resync=True)
             self._show_toast(f"{deleted_count} tallenne{'tta' if deleted_count > 1 else ''} poistettu", error=False)
             self._save_settings()
 
@@ -1195,7 +1379,7 @@ class CameraApp:
         
         self.events.clear()
         self.refresh_events_view()
-        self._update_usage_label()
+        self._update_usage_label(resync=True)
         self._show_toast(f"{deleted_count} tallennetta poistettu", error=False)
         self._save_settings()
 
@@ -1206,25 +1390,25 @@ class CameraApp:
 
     def _load_settings(self) -> None:
         try:
-            data = json.loads(Path(self._settings_path()).read_text(encoding="utf-8"))
+            stored = json.loads(Path(self._settings_path()).read_text(encoding="utf-8"))
         except Exception:
             return
-        # Ensure audio/notes state exists even if called early in __init__
-        if not hasattr(self, 'audio_enabled_var'):
-            self.audio_enabled_var = tk.BooleanVar(value=False)
-        if not hasattr(self, 'audio_device_var'):
-            self.audio_device_var = tk.StringVar(value="")
-        if not hasattr(self, '_notes_map'):
-            self._notes_map = {}
-        self.storage_limit_gb.set(float(data.get("storage_limit_gb", self.storage_limit_gb.get())))
+        if not isinstance(stored, dict):
+            self.logger.warning("settings-not-an-object")
+            return
+        # The file only holds values that differ from the defaults
+        data, errors = validate_settings(with_defaults(stored))
+        if errors:
+            self.logger.warning("settings-invalid-on-load", extra={"errors": errors})
+        self.storage_limit_gb.set(data.get("storage_limit_gb", self.storage_limit_gb.get()))
         # Validate logo path exists before using it
         loaded_logo_path = data.get("logo_path")
         if loaded_logo_path and os.path.exists(loaded_logo_path):
             self.logo_path = loaded_logo_path
         elif loaded_logo_path:
             self.logger.warning("settings-logo-path-invalid", extra={"path": loaded_logo_path})
-        self.logo_alpha.set(float(data.get("logo_alpha", self.logo_alpha.get())))
-        self.motion_threshold.set(float(data.get("motion_threshold", self.motion_threshold.get())))
+        self.logo_alpha.set(data.get("logo_alpha", self.logo_alpha.get()))
+        self.motion_threshold.set(data.get("motion_threshold", self.motion_threshold.get()))
         if "hotkeys" in data:
             self.hotkeys = HotkeyConfig.from_dict(data["hotkeys"])
         if "autoreconnect" in data:
@@ -1232,15 +1416,11 @@ class CameraApp:
             for state in self.reconnect_states:
                 state.enabled = reconnect_enabled
         # Audio settings
-        self.audio_enabled_var.set(bool(data.get("audio_enabled", self.audio_enabled_var.get())))
-        self.audio_device_var.set(str(data.get("audio_device", self.audio_device_var.get())))
+        self.audio_enabled_var.set(data.get("audio_enabled", self.audio_enabled_var.get()))
+        self.audio_device_var.set(data.get("audio_device", self.audio_device_var.get()))
         # Notes map for persistence
-        try:
-            notes = data.get("event_notes", {})
-            if isinstance(notes, dict):
-                self._notes_map = {str(k): str(v) for k, v in notes.items()}
-        except Exception:
-            self._notes_map = {}
+        notes = data.get("event_notes", {})
+        self._notes_map = {str(k): str(v) for k, v in notes.items()}
         # Populate devices after UI is built
         # Load IP cameras
         if "ip_cameras" in data:
@@ -1259,27 +1439,50 @@ class CameraApp:
                 except Exception as e:
                     self.logger.warning(f"Failed to load IP camera: {e}")
 
-    def _save_settings(self) -> None:
-        """Internal save without user feedback."""
-        payload = {
-            "storage_limit_gb": float(self.storage_limit_gb.get()),
+    def _read_var(self, var: tk.Variable) -> Any:
+        """Read a Tk variable, falling back to its raw text when it does not parse."""
+        try:
+            return var.get()
+        except tk.TclError:
+            return self.root.tk.globalgetvar(str(var))
+
+    def _collect_settings(self) -> Dict[str, Any]:
+        """Gather the raw settings payload from UI state, unvalidated."""
+        raw = {key: self._read_var(var) for key, var in self._tk_vars.items()}
+        raw.update({
             "logo_path": self.logo_path if self.logo_path and os.path.exists(self.logo_path) else "",
-            "logo_alpha": float(self.logo_alpha.get()),
-            "motion_threshold": float(self.motion_threshold.get()),
             "hotkeys": self.hotkeys.to_dict(),
             "autoreconnect": self.reconnect_states[0].enabled,
             "ip_cameras": self._serialize_ip_cameras(),
-            "audio_enabled": bool(self.audio_enabled_var.get()),
-            "audio_device": self.audio_device_var.get(),
             "event_notes": {e.path: e.note for e in self.events if (e.note or "").strip()},
-        }
-        try:
-            # Atomic write: write to temp file then rename
-            temp_path = Path(self._settings_path()).with_suffix('.tmp')
-            temp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-            temp_path.replace(self._settings_path())
-        except Exception:
-            self.logger.warning("settings-save-failed", exc_info=True)
+        })
+        return raw
+
+    def _save_settings(self, on_written: Optional[Callable[[Optional[BaseException]], None]] = None) -> Dict[str, str]:
+        """Internal save without user feedback.
+
+        Validation runs immediately on the Tk thread; the write is debounced
+        so a burst of saves becomes one serialization, one fsync and one
+        atomic rename on the settings worker. ``on_written`` is called on the
+        Tk thread with the write error, or None on success. Returns validation
+        errors keyed by setting name; nothing is written unless the whole
+        payload is valid.
+        """
+        payload, errors = validate_settings(self._collect_settings())
+        if errors:
+            self.logger.warning("settings-invalid", extra={"errors": errors})
+            return errors
+        self._pending_save = payload
+        if on_written is not None:
+            self._pending_save_callbacks.append(on_written)
+        self._pending_save_count += 1
+        if self._save_timer is not None:
+            self.root.after_cancel(self._save_timer)
+            self._save_timer = None
+        if self._pending_save_count >= SAVE_FLUSH_AFTER:
+            self._flush_save()
+        else:
+            self._save_timer = self.root.after(SAVE_DEBOUNCE_MS, self._flush_save)
 
         # If audio device list is empty in UI, try to populate lazily
         try:
@@ -1287,6 +1490,39 @@ class CameraApp:
                 self._refresh_audio_devices()
         except Exception:
             pass
+        return {}
+
+    def _flush_save(self) -> Optional[concurrent.futures.Future]:
+        """Write the latest pending settings payload, if any."""
+        if self._save_timer is not None:
+            self.root.after_cancel(self._save_timer)
+            self._save_timer = None
+        payload, callbacks = self._pending_save, self._pending_save_callbacks
+        self._pending_save, self._pending_save_callbacks = None, []
+        self._pending_save_count = 0
+        if payload is None:
+            return None
+
+        def _notify(exc: Optional[BaseException]) -> None:
+            for callback in callbacks:
+                callback(exc)
+
+        if payload == self._last_saved_payload:
+            # Nothing changed since the last write; skip the disk entirely
+            _notify(None)
+            return None
+        self._last_saved_payload = payload
+        future = self._settings_pool.submit(write_json_atomic, self._settings_path(), diff_from_defaults(payload))
+
+        def _done(f: concurrent.futures.Future) -> None:
+            exc = f.exception()
+            if exc is not None:
+                self._last_saved_payload = None
+                self.logger.warning("settings-save-failed", exc_info=exc)
+            _notify(exc)
+
+        self._when_done(future, _done)
+        return future
     
     def _serialize_ip_cameras(self) -> List[Dict[str, Any]]:
         """Serialize IP cameras for JSON storage.
@@ -1316,11 +1552,18 @@ class CameraApp:
     
     def _save_settings_safely(self) -> None:
         """Save settings with user feedback, doesn't stop recording."""
-        try:
-            self._save_settings()
+        def _on_written(exc: Optional[BaseException]) -> None:
+            if exc is not None:
+                messagebox.showerror("Virhe", f"Asetusten tallennus epäonnistui: {exc}")
+                return
             self.settings_status_var.set("✓ Asetukset tallennettu")
             self.root.after(3000, lambda: self.settings_status_var.set(""))
             self.logger.info("settings-saved-by-user")
+
+        try:
+            errors = self._save_settings(on_written=_on_written)
+            if errors:
+                messagebox.showerror("Virhe", f"Tarkista asetukset:\n{format_errors(errors)}")
         except Exception as exc:
             self.logger.exception("settings-save-failed", exc_info=exc)
             messagebox.showerror("Virhe", f"Asetusten tallennus epäonnistui: {exc}")
@@ -1360,46 +1603,50 @@ class CameraApp:
                     self.logger.warning("delete-failed", extra={"path": str(file)}, exc_info=True)
         self.events.clear()
         self.refresh_events_view()
-        self._update_usage_label()
+        self._update_usage_label(resync=True)
 
     def _choose_logo(self) -> None:
-        path = filedialog.askopenfilename(title="Valitse logo", filetypes=[("Kuvat", "*.png;*.jpg;*.jpeg;*.bmp"), ("Kaikki", "*.*")])
+        path = filedialog.askopenfilename(title="Valitse logo", filetypes=self.LOGO_FILETYPES)
         if not path:
             return
         self.logo_path = path
         self.logo_path_var.set(path)
-        self._load_logo(path)
-        self._update_logo_preview()
+        self.logo_preview_label.configure(image="", text="Ladataan...")
+        # Decode off the Tk thread; the result is installed once ready
+        future = self._io_pool.submit(self._decode_logo, path)
+        self._when_done(future, lambda f: self._apply_prefetched_logo(path, f))
         # Don't auto-save, let user click "Tallenna asetukset"
 
+    def _apply_prefetched_logo(self, path: str, future: concurrent.futures.Future) -> None:
+        if path != self.logo_path:
+            return  # A newer selection superseded this decode
+        self.logo_bgra = future.result()
+        self._logo_cache.clear()
+        self._update_logo_preview()
+
     def _update_logo_preview(self) -> None:
-        """Update logo preview immediately after selection."""
+        """Update logo preview from the already-decoded logo."""
         path = self.logo_path
         if not path or not hasattr(self, 'logo_preview_label'):
             return
-        # Check if path exists before trying to load
-        if not os.path.exists(path):
-            self.logo_preview_label.configure(image="", text="Logo tiedostoa ei löytynyt")
+        logo = self.logo_bgra
+        if logo is None:
+            # _load_logo already tried; report why there is nothing to show
+            if not os.path.exists(path):
+                self.logo_preview_label.configure(image="", text="Logo tiedostoa ei löytynyt")
+            else:
+                self.logo_preview_label.configure(image="", text="Logoa ei voitu ladata")
             return
         try:
-            img = cv2.imread(path, cv2.IMREAD_UNCHANGED)
-            if img is None:
-                self.logo_preview_label.configure(image="", text="Logoa ei voitu ladata")
-                return
-            
             # Resize for preview (max 200x100)
-            h, w = img.shape[:2]
+            h, w = logo.shape[:2]
             scale = min(200 / w, 100 / h, 1.0)
-            new_w, new_h = int(w * scale), int(h * scale)
-            resized = cv2.resize(img, (new_w, new_h), interpolation=cv2.INTER_AREA)
-            
-            # Convert for Tkinter
-            if resized.shape[2] == 4:
-                resized_rgb = cv2.cvtColor(resized, cv2.COLOR_BGRA2RGBA)
-            else:
-                resized_rgb = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB)
+            new_w, new_h = max(1, int(w * scale)), max(1, int(h * scale))
+            resized = cv2.resize(logo, (new_w, new_h), interpolation=cv2.INTER_AREA)
             
-            preview_img = Image.fromarray(resized_rgb)
+            # Convert for Tkinter; _decode_logo always yields BGRA, which PIL
+            # unpacks straight from the array buffer
+            preview_img = Image.frombuffer("RGBA", (new_w, new_h), resized, "raw", "BGRA", 0, 1)
             preview_tk = ImageTk.PhotoImage(image=preview_img)
             
             self.logo_preview_label.configure(image=preview_tk, text="")
@@ -1409,47 +1656,55 @@ class CameraApp:
             self.logo_preview_label.configure(image="", text="Esikatselun lataus epäonnistui")
 
     def _load_logo(self, path: Optional[str]) -> None:
-        self.logo_bgra = None
+        self.logo_bgra = self._decode_logo(path)
+        self._logo_cache.clear()
+
+    @staticmethod
+    def _decode_logo(path: Optional[str]) -> Optional[np.ndarray]:
+        """Decode a logo file into BGRA; thread-safe, touches no UI state."""
         if not path:
-            return
+            return None
         # Validate path exists before attempting to load
         if not os.path.exists(path):
-            self.logger.warning("logo-path-not-found", extra={"path": path})
-            return
+            LOGGER.warning("logo-path-not-found", extra={"path": path})
+            return None
         try:
             img = cv2.imread(path, cv2.IMREAD_UNCHANGED)
             if img is None:
-                self.logger.warning("logo-load-failed", extra={"path": path})
-                return
-            if img.shape[2] == 3:
-                b, g, r = cv2.split(img)
-                a = np.full_like(b, 255)
-                img = cv2.merge((b, g, r, a))
-            self.logo_bgra = img
-        except Exception as e:
-            self.logger.error("logo-load-error", exc_info=True)
+                LOGGER.warning("logo-load-failed", extra={"path": path})
+                return None
+            if img.ndim == 2:
+                img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGRA)
+            elif img.shape[2] == 3:
+                # One pass that appends an opaque alpha channel
+                img = cv2.cvtColor(img, cv2.COLOR_BGR2BGRA)
+            return img
+        except Exception:
+            LOGGER.error("logo-load-error", exc_info=True)
+            return None
 
-    def _overlay_logo(self, frame_bgr: np.ndarray) -> np.ndarray:
-        if self.logo_bgra is None:
+    def _overlay_logo(self, frame_bgr: np.ndarray, logo_alpha: float) -> np.ndarray:
+        logo = self.logo_bgra
+        if logo is None:
             return frame_bgr
-        overlay = self.logo_bgra
         h, w = frame_bgr.shape[:2]
-        target_w = max(1, int(w * 0.18))
-        scale = target_w / overlay.shape[1]
-        new_size = (target_w, max(1, int(overlay.shape[0] * scale)))
-        resized = cv2.resize(overlay, new_size, interpolation=cv2.INTER_AREA)
-        oh, ow = resized.shape[:2]
-        x = w - ow - 20
-        y = 20
-        if x < 0 or y < 0 or x + ow > w or y + oh > h:
+        key = (h, w, round(logo_alpha, 3))
+        # Both frame workers share the cache
+        with self._logo_lock:
+            cached = self._logo_cache.get(key)
+            if cached is None:
+                # Reuse the resize from another alpha at this size when we have one
+                fits = {(ch, cw): f for (ch, cw, _), (f, _) in self._logo_cache.items()}
+                fit = fits[(h, w)] if (h, w) in fits else fit_logo(logo, (h, w))
+                if len(self._logo_cache) >= LOGO_CACHE_MAX:
+                    self._logo_cache.clear()  # Slider drags would otherwise pile up entries
+                # A logo that does not fit is cached as (None, None) so the
+                # next frame skips fit_logo as well
+                cached = (fit, None if fit is None else logo_weights(fit, key[2]))
+                self._logo_cache[key] = cached
+        if cached[0] is None:
             return frame_bgr
-        roi = frame_bgr[y:y + oh, x:x + ow]
-        alpha = (resized[..., 3].astype("float32") / 255.0) * float(self.logo_alpha.get())
-        alpha_bg = 1.0 - alpha
-        for c in range(3):
-            roi[..., c] = (alpha * resized[..., c] + alpha_bg * roi[..., c]).astype("uint8")
-        frame_bgr[y:y + oh, x:x + ow] = roi
-        return frame_bgr
+        return blend_weighted(frame_bgr, *cached)
 
     def _on_motion_change(self) -> None:
         self.motion_thresh_label_var.set(f"{int(float(self.motion_threshold.get()) * 100)} %")
@@ -1462,16 +1717,26 @@ class CameraApp:
 
     def _dir_size_bytes(self, path: Path) -> int:
         total = 0
-        for file in path.glob("*"):
-            if file.is_file():
-                try:
-                    total += file.stat().st_size
-                except Exception:
-                    self.logger.warning("stat-failed", extra={"path": str(file)}, exc_info=True)
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        # DirEntry caches type and, on Windows, stat from the directory read
+                        if entry.is_file():
+                            total += entry.stat().st_size
+                    except OSError:
+                        self.logger.warning("stat-failed", extra={"path": entry.path}, exc_info=True)
+        except OSError:
+            self.logger.warning("scandir-failed", extra={"path": str(path)}, exc_info=True)
         return total
 
-    def _update_usage_label(self) -> None:
-        used = self._dir_size_bytes(self.record_dir)
+    def _update_usage_label(self, resync: bool = False) -> None:
+        """Render folder usage from the running total, rescanning only when due."""
+        now = time.monotonic()
+        if resync or self._usage_synced_at is None or now - self._usage_synced_at >= USAGE_RESYNC_SECONDS:
+            self._usage_bytes = self._dir_size_bytes(self.record_dir)
+            self._usage_synced_at = now
+        used = self._usage_bytes
         limit_b = int(max(0.0001, float(self.storage_limit_gb.get())) * (1024 ** 3))
         pct = format_percentage(used, limit_b)
         self.usage_label_var.set(f"Käyttöaste: {pct}, {format_bytes(used)} / {format_bytes(limit_b)}")
@@ -1552,11 +1817,19 @@ class CameraApp:
     def _enforce_storage_limit(self) -> None:
         limit_b = int(max(0.0001, float(self.storage_limit_gb.get())) * (1024 ** 3))
         files = []
-        for file in self.record_dir.glob("*.avi"):
-            try:
-                files.append((file.stat().st_mtime, file, file.stat().st_size))
-            except Exception:
-                self.logger.warning("stat-failed", extra={"path": str(file)}, exc_info=True)
+        try:
+            with os.scandir(self.record_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(RECORDING_SUFFIXES):
+                        continue
+                    try:
+                        if entry.is_file():
+                            st = entry.stat()
+                            files.append((st.st_mtime, Path(entry.path), st.st_size))
+                    except OSError:
+                        self.logger.warning("stat-failed", extra={"path": entry.path}, exc_info=True)
+        except OSError:
+            self.logger.warning("scandir-failed", extra={"path": str(self.record_dir)}, exc_info=True)
         files.sort()
         total = sum(size for _, _, size in files)
         idx = 0
@@ -1565,6 +1838,7 @@ class CameraApp:
             try:
                 file.unlink()
                 total -= size
+                self._usage_bytes = max(0, self._usage_bytes - size)
             except Exception:
                 self.logger.warning("unlink-failed", extra={"path": str(file)}, exc_info=True)
             idx += 1
@@ -1704,7 +1978,7 @@ class CameraApp:
                 messagebox.showerror("Virhe", f"Poisto epäonnistui: {path_str}\n{exc}")
         
         self.refresh_events_view()
-        self._update_usage_label()
+        self._update_usage_label(resync=True)
 
     def _pan_camera(self, slot: int, dx: float, dy: float) -> None:
         """Pan a specific camera's view."""
@@ -1717,10 +1991,41 @@ class CameraApp:
                 messagebox.showinfo("Huom", "Ei kuvaa tallennettavana.")
                 return
             ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-            path = self.record_dir / f"snapshot_cam{slot}_{ts}.png"
-            success = cv2.imwrite(str(path), self.last_frames_bgr[slot])
-            if not success:
-                raise RuntimeError(f"Kuvan kirjoitus epäonnistui: {path}")
+            path = self.record_dir / f"snapshot_cam{slot}_{ts}.jpg"
+            frame = self.last_frames_bgr[slot]
+            detections = self._snapshot_detections[slot]
+            logo_alpha = float(self.logo_alpha.get())
+            # Overlay drawing and the JPEG encode both run on the IO pool
+            future = self._io_pool.submit(
+                lambda: self._write_snapshot(path, self._render_snapshot(slot, frame, detections, logo_alpha))
+            )
+            self._when_done(future, lambda f: self._on_snapshot_written(f, path))
+        except Exception as e:
+            self.logger.error("snapshot-failed", exc_info=True)
+            messagebox.showerror("Virhe", f"Kuvakaappauksen tallennus epäonnistui: {str(e)}")
+
+    def _render_snapshot(self, slot: int, frame_bgr: np.ndarray, detections: List[Any], logo_alpha: float) -> np.ndarray:
+        """Return the native-resolution snapshot with the live-view overlays."""
+        width = frame_bgr.shape[1]
+        if width <= PIPELINE_MAX_WIDTH:
+            return frame_bgr  # The pipeline already annotated this frame in place
+        scale = width / float(PIPELINE_MAX_WIDTH)
+        scaled = [(tuple(int(v * scale) for v in box), conf) for box, conf in detections]
+        # Draw on a copy; the referenced capture stays as it was read
+        return self._annotate(slot, frame_bgr.copy(), scaled, logo_alpha)
+
+    @staticmethod
+    def _write_snapshot(path: Path, frame_bgr: np.ndarray) -> None:
+        """Encode in memory and write the bytes; Python file IO handles any path."""
+        ok, encoded = cv2.imencode(".jpg", frame_bgr, SNAPSHOT_JPEG_PARAMS)
+        if not ok:
+            raise RuntimeError(f"Kuvan pakkaus epäonnistui: {path}")
+        path.write_bytes(encoded.tobytes())
+
+    def _on_snapshot_written(self, future: "concurrent.futures.Future[None]", path: Path) -> None:
+        """Report the background snapshot write result on the Tk thread."""
+        try:
+            future.result()
             messagebox.showinfo("Tallennettu", f"Kuvakaappaus tallennettu:\n{path}")
         except Exception as e:
             self.logger.error("snapshot-failed", exc_info=True)
@@ -1730,10 +2035,17 @@ class CameraApp:
         try:
             if sys.platform.startswith("win"):
                 os.startfile(str(self.record_dir))
-            elif sys.platform == "darwin":
-                os.system(f"open '{self.record_dir}'")
             else:
-                os.system(f"xdg-open '{self.record_dir}' >/dev/null 2>&1 &")
+                # Launch the opener directly: no shell, so any path is passed as-is
+                opener = shutil.which("open" if sys.platform == "darwin" else "xdg-open")
+                if opener is None:
+                    raise FileNotFoundError("Tiedostonhallinnan avaajaa ei löytynyt")
+                subprocess.Popen(
+                    [opener, str(self.record_dir)],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True,
+                )
         except Exception as exc:
             messagebox.showerror("Virhe", f"Kansion avaaminen epäonnistui: {exc}")
 
@@ -1787,15 +2099,13 @@ class CameraApp:
             return
         
         try:
-            cap = cv2.VideoCapture(saved_index, cv2.CAP_DSHOW)
-            cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
-            
+            cap = self._open_usb_capture(saved_index)
+
             if cap.isOpened():
                 # Test read
                 ok, _ = cap.read()
                 if ok:
-                    self.caps[slot] = cap
+                    self._install_capture(slot, cap)
                     self._reconnect_attempts[slot] = 0
                     self.reconnect_delay[slot] = 1.0
                     self.status_var.set(f"Kamera {slot + 1} yhdistetty uudelleen")
@@ -1832,13 +2142,37 @@ class CameraApp:
                     cap.release()
                 except Exception:
                     pass
-        if self.playback_vc is not None:
+        if self.playback_reader is not None:
             try:
-                self.playback_vc.release()
+                self.playback_reader.release()
             except Exception:
                 pass
+        self._detector.close()
+        for recorder in self.recorders:
+            try:
+                recorder.close()
+            except Exception:
+                self.logger.warning("recorder-close-failed", exc_info=True)
+        try:
+            self._flush_save()
+        except Exception:
+            self.logger.warning("settings-flush-failed", exc_info=True)
+        self._frame_pool.shutdown(wait=True)
+        self._io_pool.shutdown(wait=True)
+        self._settings_pool.shutdown(wait=True)
         self.root.destroy()
 
+    def _when_done(self, future: concurrent.futures.Future, callback: Callable[[concurrent.futures.Future], None]) -> None:
+        """Run callback(future) on the Tk thread once a background future completes.
+
+        Polls from the Tk thread instead of calling Tk from the worker, so
+        shutting a pool down with wait=True can never deadlock on the UI.
+        """
+        if future.done():
+            callback(future)
+        else:
+            self.root.after(25, self._when_done, future, callback)
+
     def _show_toast(self, message: str, error: bool = False) -> None:
         """Display a temporary toast notification."""
         if self._toast_window is not None:
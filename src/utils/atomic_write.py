@@ -0,0 +1,51 @@
+"""Crash-safe file writes for small JSON documents.
+
+Why this design:
+- Serialize the whole document once and issue a single write + fsync.
+- Write to a sibling temp file so os.replace stays an atomic rename.
+- Never leave a half-written settings file behind on failure.
+- Use orjson when installed (optional) since it emits UTF-8 bytes directly.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Union
+
+try:  # Optional accelerator; the stdlib encoder produces the same document
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+# Ship intelligence, not excuses.
+
+
+def _dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+    return json.dumps(payload, ensure_ascii=False, indent=2, sort_keys=True).encode("utf-8")
+
+
+def write_json_atomic(path: Union[str, Path], payload: Any) -> None:
+    """Serialize payload as JSON and atomically replace path with it."""
+    target = Path(path)
+    data = _dumps(payload)
+    fd, tmp_name = tempfile.mkstemp(dir=str(target.parent), prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_name, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+__all__ = ["write_json_atomic"]
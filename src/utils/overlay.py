@@ -0,0 +1,111 @@
+"""Logo overlay helpers for branded video frames.
+
+Why this design:
+- Resolve logo geometry once per frame size instead of on every frame.
+- Keep the per-frame path to a single ROI slice plus one integer blend.
+- Stay independent of Tkinter so the math is easy to test.
+- Fuse the blend into one JIT kernel when numba is installed (optional);
+  the NumPy expression computes the same result without it.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+try:  # Optional accelerator
+    from numba import njit  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    njit = None
+
+# Ship intelligence, not excuses.
+
+LOGO_WIDTH_RATIO = 0.18
+LOGO_MARGIN_PX = 20
+
+
+@dataclass(frozen=True)
+class LogoFit:
+    """Logo resized and positioned for one frame size."""
+
+    frame_size: Tuple[int, int]
+    roi: Tuple[slice, slice]
+    bgr: np.ndarray  # uint16 so the blend multiply never overflows
+    alpha: np.ndarray  # uint16 0..255, shaped (h, w, 1) to broadcast over BGR
+
+
+def fit_logo(logo_bgra: np.ndarray, frame_size: Tuple[int, int]) -> Optional[LogoFit]:
+    """Resize the logo for a (height, width) frame and anchor it top-right.
+
+    Returns None when the logo does not fit inside the frame.
+    """
+    h, w = frame_size
+    target_w = max(1, int(w * LOGO_WIDTH_RATIO))
+    scale = target_w / logo_bgra.shape[1]
+    new_size = (target_w, max(1, int(logo_bgra.shape[0] * scale)))
+    resized = cv2.resize(logo_bgra, new_size, interpolation=cv2.INTER_AREA)
+    oh, ow = resized.shape[:2]
+    x = w - ow - LOGO_MARGIN_PX
+    y = LOGO_MARGIN_PX
+    if x < 0 or x + ow > w or y + oh > h:
+        return None
+    return LogoFit(
+        frame_size=(h, w),
+        roi=(slice(y, y + oh), slice(x, x + ow)),
+        bgr=resized[..., :3].astype(np.uint16),
+        alpha=resized[..., 3:4].astype(np.uint16),
+    )
+
+
+def logo_weights(fit: LogoFit, opacity: float) -> np.ndarray:
+    """Return per-pixel logo weights in 0..256 for the given opacity."""
+    scale = int(round(min(max(float(opacity), 0.0), 1.0) * 256))
+    return (fit.alpha * scale) // 255
+
+
+if njit is not None:
+
+    # Serial on purpose: the ROI is tiny, and both frame workers call this at
+    # once, which numba's workqueue threading layer aborts on when parallel.
+    # nogil lets the two workers blend at the same time.
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _blend_kernel(roi, logo_bgr, weights):  # pragma: no cover - needs numba
+        for i in range(roi.shape[0]):
+            for j in range(roi.shape[1]):
+                w = weights[i, j, 0]
+                for c in range(3):
+                    roi[i, j, c] = (logo_bgr[i, j, c] * w + roi[i, j, c] * (256 - w)) >> 8
+
+else:
+    _blend_kernel = None
+
+
+def warm_up_blend() -> None:
+    """Compile the JIT blend ahead of the first frame; no-op without numba."""
+    if _blend_kernel is None:
+        return
+    # Live frames pass frame[fit.roi], a non-contiguous view, so warm up with
+    # one too; a contiguous array would compile a signature never used
+    roi = np.zeros((4, 4, 3), dtype=np.uint8)[1:3, 1:3]
+    _blend_kernel(roi, np.zeros((2, 2, 3), dtype=np.uint16), np.zeros((2, 2, 1), dtype=np.uint16))
+
+
+def blend_weighted(frame_bgr: np.ndarray, fit: LogoFit, weights: np.ndarray) -> np.ndarray:
+    """Blend a fitted logo in place using weights from logo_weights()."""
+    roi = frame_bgr[fit.roi]
+    if _blend_kernel is not None:
+        _blend_kernel(roi, fit.bgr, weights)
+        return frame_bgr
+    roi[:] = ((fit.bgr * weights + roi.astype(np.uint16) * (256 - weights)) >> 8).astype(np.uint8)
+    return frame_bgr
+
+
+def blend_logo(frame_bgr: np.ndarray, fit: LogoFit, opacity: float) -> np.ndarray:
+    """Alpha-blend a fitted logo into the frame in place."""
+    return blend_weighted(frame_bgr, fit, logo_weights(fit, opacity))
+
+
+__all__ = ["LogoFit", "fit_logo", "logo_weights", "blend_weighted", "blend_logo", "warm_up_blend"]
@@ -1,5 +1,10 @@
 """Tests for app-level functionality."""
 
+import threading
+
+import numpy as np
+import pytest
+
 from src.utils.zoom import ZoomState
 
 
@@ -32,3 +37,70 @@ def test_zoom_out_below_one():
     state.zoom_out()
     assert state.factor == 0.5
 
+
+class _StubRecorder:
+    def update(self, frame, motion_trigger, person_count, now=None):
+        return None, None
+
+
+def _pipeline_app():
+    from src.ui.app import CameraApp
+
+    app = CameraApp.__new__(CameraApp)
+    app.recorders = [_StubRecorder(), _StubRecorder()]
+    app.last_frames_bgr = [None, None]
+    app._snapshot_detections = [[], []]
+    app.logo_bgra = None
+    app._logo_lock = threading.Lock()
+    app._logo_cache = {}
+    app._ts_cache = (0, "")
+    return app
+
+
+@pytest.mark.parametrize("width", [640, 1920])
+def test_snapshot_keeps_native_resolution_with_overlays(width):
+    """Snapshots keep the camera's full width and carry the live-view overlays."""
+    from src.ui.app import FrameOptions
+
+    app = _pipeline_app()
+    opts = FrameOptions(motion=False, motion_threshold=0.0, person=False, logo_alpha=1.0, display=False, now=0.0)
+    frame = np.zeros((width * 9 // 16, width, 3), dtype=np.uint8)
+
+    app._process_slot(0, frame, opts)
+
+    assert app.last_frames_bgr[0] is frame  # a reference, never a copy
+    snapshot = app._render_snapshot(0, frame, app._snapshot_detections[0], 1.0)
+    assert snapshot.shape == frame.shape
+    assert snapshot.any()  # the clock overlay was drawn onto it
+
+
+def test_wide_snapshot_overlays_leave_the_capture_untouched():
+    app = _pipeline_app()
+    frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+
+    snapshot = app._render_snapshot(0, frame, [((10, 10, 20, 40), 0.9)], 1.0)
+
+    assert not frame.any()
+    assert snapshot[20, 21].any()  # box scaled by 2 from pipeline space
+
+
+def test_logo_that_does_not_fit_is_fitted_once(monkeypatch):
+    from src.ui import app as app_module
+
+    calls = []
+
+    def no_fit(logo, size):
+        calls.append(size)
+        return None
+
+    monkeypatch.setattr(app_module, "fit_logo", no_fit)
+    app = app_module.CameraApp.__new__(app_module.CameraApp)
+    app.logo_bgra = np.zeros((8, 8, 4), dtype=np.uint8)
+    app._logo_lock = threading.Lock()
+    app._logo_cache = {}
+    frame = np.zeros((4, 4, 3), dtype=np.uint8)
+
+    for _ in range(3):
+        assert app._overlay_logo(frame, 0.5) is frame
+    app._overlay_logo(frame, 0.8)  # another alpha at the same size reuses the miss
+    assert calls == [(4, 4)]
@@ -0,0 +1,25 @@
+"""Tests for atomic JSON persistence."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.utils.atomic_write import write_json_atomic
+
+
+def test_write_json_atomic_roundtrip(tmp_path):
+    target = tmp_path / "settings.json"
+    write_json_atomic(target, {"storage_limit_gb": 5.0, "audio_device": "Mikrofoni"})
+    assert json.loads(target.read_text(encoding="utf-8")) == {"storage_limit_gb": 5.0, "audio_device": "Mikrofoni"}
+    assert [p.name for p in tmp_path.iterdir()] == ["settings.json"]
+
+
+def test_write_json_atomic_keeps_old_file_on_failure(tmp_path):
+    target = tmp_path / "settings.json"
+    write_json_atomic(target, {"logo_alpha": 0.25})
+    with patch("src.utils.atomic_write.os.replace", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            write_json_atomic(target, {"logo_alpha": 0.9})
+    assert json.loads(target.read_text(encoding="utf-8")) == {"logo_alpha": 0.25}
+    assert [p.name for p in tmp_path.iterdir()] == ["settings.json"]
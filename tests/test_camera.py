@@ -0,0 +1,75 @@
+"""Tests for USB camera discovery."""
+
+import time
+
+from src.services import camera
+
+
+class FakeCapture:
+    working = {0, 2}
+    slow = set()
+
+    def __init__(self, idx, _backend=None) -> None:
+        self.idx = idx
+        self.released = False
+
+    def isOpened(self) -> bool:
+        return self.idx in self.working or self.idx in self.slow
+
+    def read(self):
+        if self.idx in self.slow:
+            time.sleep(0.5)
+        return True, object()
+
+    def release(self) -> None:
+        self.released = True
+
+
+def test_list_cameras_names_working_indices_in_order(monkeypatch):
+    monkeypatch.setattr(camera.cv2, "VideoCapture", FakeCapture)
+    assert camera.list_cameras(max_indices=4) == [("usb-1", 0), ("usb-2", 2)]
+
+
+def test_slow_opening_camera_is_still_found(monkeypatch):
+    class SlowOpen(FakeCapture):
+        def __init__(self, idx, _backend=None) -> None:
+            super().__init__(idx, _backend)
+            if idx == 1:
+                time.sleep(1.3)  # slower than probe_timeout, like some DSHOW drivers
+
+    monkeypatch.setattr(camera.cv2, "VideoCapture", SlowOpen)
+    monkeypatch.setattr(FakeCapture, "working", {0, 1})
+    assert camera.list_cameras(max_indices=3, probe_timeout=1.0) == [("usb-1", 0), ("usb-2", 1)]
+
+
+def test_read_is_retried_until_first_frame(monkeypatch):
+    class WarmingUp(FakeCapture):
+        def __init__(self, idx, _backend=None) -> None:
+            super().__init__(idx, _backend)
+            self.reads = 0
+
+        def read(self):
+            self.reads += 1
+            return (self.reads >= 4), None
+
+    monkeypatch.setattr(camera.cv2, "VideoCapture", WarmingUp)
+    monkeypatch.setattr(camera, "READ_RETRY_SECONDS", 0.01)
+    assert camera.list_cameras(max_indices=1, probe_timeout=1.0) == [("usb-1", 0)]
+
+
+def test_list_cameras_probes_concurrently_and_bounds_the_scan(monkeypatch):
+    monkeypatch.setattr(camera.cv2, "VideoCapture", FakeCapture)
+    monkeypatch.setattr(FakeCapture, "slow", {1, 3})
+    start = time.monotonic()
+    # Slow indices still deliver within the scan deadline, in parallel
+    assert camera.list_cameras(max_indices=4) == [("usb-1", 0), ("usb-2", 1), ("usb-3", 2), ("usb-4", 3)]
+    assert time.monotonic() - start < 0.9
+
+
+def test_hung_probe_is_abandoned_at_scan_deadline(monkeypatch):
+    monkeypatch.setattr(camera.cv2, "VideoCapture", FakeCapture)
+    monkeypatch.setattr(FakeCapture, "slow", {1})
+    start = time.monotonic()
+    result = camera.list_cameras(max_indices=3, scan_timeout=0.2)
+    assert time.monotonic() - start < 0.45
+    assert result == [("usb-1", 0), ("usb-2", 2)]
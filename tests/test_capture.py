@@ -0,0 +1,43 @@
+"""Tests for the background frame grabber."""
+
+import threading
+import time
+
+import numpy as np
+
+from src.services.capture import FrameGrabber
+
+
+class FakeCapture:
+    def __init__(self) -> None:
+        self.count = 0
+        self.released = threading.Event()
+
+    def isOpened(self) -> bool:
+        return not self.released.is_set()
+
+    def read(self):
+        time.sleep(0.002)
+        self.count += 1
+        return True, np.full((2, 2, 3), self.count % 256, dtype=np.uint8)
+
+    def release(self) -> None:
+        self.released.set()
+
+
+def test_latest_only_returns_new_frames():
+    cap = FakeCapture()
+    grabber = FrameGrabber(cap)
+    try:
+        deadline = time.monotonic() + 2.0
+        frame, seq = grabber.latest()
+        while frame is None and time.monotonic() < deadline:
+            time.sleep(0.005)
+            frame, seq = grabber.latest()
+        assert frame is not None and seq >= 1
+        again, same_seq = grabber.latest(seq + 10**6)
+        assert again is None
+    finally:
+        grabber.release()
+    assert cap.released.is_set()
+    assert not grabber.isOpened()
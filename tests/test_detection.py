@@ -0,0 +1,122 @@
+"""Tests for the background person detector."""
+
+import threading
+import time
+from typing import List
+
+import numpy as np
+
+from src.core.detection import AsyncPersonDetector, DnnPersonDetector, create_person_detector
+
+
+class FakeDetector:
+    def __init__(self) -> None:
+        self.shapes: List[tuple] = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def detect(self, frame_bgr: np.ndarray):
+        self.release.wait(2.0)
+        self.shapes.append(frame_bgr.shape)
+        return [((10, 20, 30, 40), 0.9)]
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_detections_are_scaled_back_to_frame_coordinates():
+    fake = FakeDetector()
+    detector = AsyncPersonDetector(fake, max_width=640)
+    try:
+        detector.submit(0, np.zeros((720, 1280, 3), dtype=np.uint8))
+        assert _wait_for(lambda: detector.latest(0))
+        assert fake.shapes == [(360, 640, 3)]
+        assert detector.latest(0) == [((20, 40, 60, 80), 0.9)]
+        assert detector.latest(1) == []
+    finally:
+        detector.close()
+
+
+def test_pending_frame_is_replaced_by_newer_one():
+    fake = FakeDetector()
+    fake.release.clear()
+    detector = AsyncPersonDetector(fake, max_width=640)
+    try:
+        detector.submit(0, np.zeros((10, 10, 3), dtype=np.uint8))
+        time.sleep(0.05)  # Worker is now blocked inside detect()
+        detector.submit(0, np.zeros((11, 10, 3), dtype=np.uint8))
+        detector.submit(0, np.zeros((12, 10, 3), dtype=np.uint8))
+        fake.release.set()
+        assert _wait_for(lambda: len(fake.shapes) == 2)
+        time.sleep(0.05)
+        assert fake.shapes == [(10, 10, 3), (12, 10, 3)]
+    finally:
+        detector.close()
+
+
+def test_clear_discards_in_flight_result():
+    fake = FakeDetector()
+    fake.release.clear()
+    detector = AsyncPersonDetector(fake)
+    try:
+        detector.submit(1, np.zeros((10, 10, 3), dtype=np.uint8))
+        time.sleep(0.05)
+        detector.clear(1)
+        fake.release.set()
+        assert _wait_for(lambda: len(fake.shapes) == 1)
+        time.sleep(0.05)
+        assert detector.latest(1) == []
+    finally:
+        detector.close()
+
+
+class FakeNet:
+    def __init__(self, rows) -> None:
+        self.rows = np.array(rows, dtype=np.float32).reshape(1, 1, -1, 7)
+        self.blob_shape = None
+
+    def setInput(self, blob) -> None:
+        self.blob_shape = blob.shape
+
+    def forward(self):
+        return self.rows
+
+
+def test_dnn_detector_keeps_confident_people_only():
+    net = FakeNet([
+        [0, 15, 0.9, 0.1, 0.2, 0.5, 0.8],   # person
+        [0, 15, 0.3, 0.0, 0.0, 1.0, 1.0],   # person, too weak
+        [0, 7, 0.99, 0.0, 0.0, 0.5, 0.5],   # car
+    ])
+    detector = DnnPersonDetector(net)
+    detections = detector.detect(np.zeros((100, 200, 3), dtype=np.uint8))
+    assert net.blob_shape == (1, 3, 300, 300)
+    assert len(detections) == 1
+    (x, y, w, h), conf = detections[0]
+    assert (x, y, w, h) == (20, 20, 80, 60)
+    assert abs(conf - 0.9) < 1e-6
+
+
+def test_factory_falls_back_to_hog_without_models(monkeypatch):
+    class StubHog:
+        def __init__(self, win_stride=(8, 8)) -> None:
+            self.win_stride = win_stride
+
+    monkeypatch.setattr("src.core.detection.find_resource", lambda _rel: None)
+    monkeypatch.setattr("src.core.detection.PersonDetector", StubHog)
+    detector = create_person_detector()
+    assert isinstance(detector, StubHog)
+    assert detector.win_stride == (16, 16)
+
+
+def test_sigmoid_is_vectorized_and_saturates():
+    from src.core.detection import _sigmoid
+
+    confs = _sigmoid(np.array([-1000.0, 0.0, 1000.0]))
+    assert confs.tolist() == [0.0, 0.5, 1.0]
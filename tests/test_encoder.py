@@ -0,0 +1,111 @@
+"""Tests for the ffmpeg hardware encoder probe and pipe writer."""
+
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from src.services import encoder
+
+
+@pytest.fixture(autouse=True)
+def _fresh_probe(monkeypatch):
+    monkeypatch.setattr(encoder, "_probe_done", False)
+    monkeypatch.setattr(encoder, "_probe_result", None)
+
+
+def test_no_ffmpeg_means_no_encoder(monkeypatch):
+    monkeypatch.setattr(encoder, "find_ffmpeg", lambda: None)
+    assert encoder.detect_hw_encoder() is None
+
+
+def test_probe_skips_listed_but_unusable_encoders(monkeypatch):
+    calls = []
+    listing = " V....D h264_nvenc  NVIDIA NVENC\n V....D h264_qsv  Intel QSV\n V....D libx264  x264\n"
+
+    def fake_run(cmd):
+        calls.append(cmd)
+        if "-encoders" in cmd:
+            return subprocess.CompletedProcess(cmd, 0, stdout=listing, stderr="")
+        ok = "h264_qsv" in cmd
+        return subprocess.CompletedProcess(cmd, 0 if ok else 1, stdout="", stderr="")
+
+    monkeypatch.setattr(encoder, "find_ffmpeg", lambda: "ffmpeg")
+    monkeypatch.setattr(encoder, "_run", fake_run)
+    assert encoder.detect_hw_encoder() == "h264_qsv"
+    probes = len(calls)
+    assert encoder.detect_hw_encoder() == "h264_qsv"
+    assert len(calls) == probes  # cached after the first probe
+
+
+def test_non_blocking_lookup_skips_a_running_probe(monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_probe(_ffmpeg):
+        started.set()
+        release.wait(2.0)
+        return "h264_nvenc"
+
+    monkeypatch.setattr(encoder, "find_ffmpeg", lambda: "ffmpeg")
+    monkeypatch.setattr(encoder, "_probe", slow_probe)
+    assert encoder.detect_hw_encoder(wait=False) is None  # starts the probe
+    assert started.wait(2.0)
+    before = time.monotonic()
+    assert encoder.detect_hw_encoder(wait=False) is None
+    assert time.monotonic() - before < 0.5
+    release.set()
+    assert encoder.detect_hw_encoder() == "h264_nvenc"
+    assert encoder.detect_hw_encoder(wait=False) == "h264_nvenc"
+
+
+def test_build_command_reads_raw_bgr_from_stdin():
+    cmd = encoder.build_command("ffmpeg", Path("out.mp4"), 30, (640, 480), "h264_nvenc")
+    assert cmd[-1] == "out.mp4"
+    assert cmd[cmd.index("-pix_fmt") + 1] == "bgr24"
+    assert cmd[cmd.index("-s") + 1] == "640x480"
+    assert cmd[cmd.index("-c:v") + 1] == "h264_nvenc"
+    assert cmd.index("pipe:0") < cmd.index("-c:v")
+
+
+def test_recorder_falls_back_to_mjpg_without_hw_encoder(monkeypatch, tmp_path):
+    from src.services import recording
+
+    monkeypatch.setattr(recording, "detect_hw_encoder", lambda wait=True: None)
+    recorder = recording.RollingRecorder(recording.RecorderConfig(out_dir=tmp_path, cam_slot=1))
+    writer = recorder._default_writer_factory((64, 48))
+    try:
+        assert recorder._event_path is not None and recorder._event_path.suffix == ".avi"
+    finally:
+        writer.release()
+
+
+def test_pipe_writer_sends_frame_blocks_in_one_write(tmp_path, monkeypatch):
+    import numpy as np
+
+    monkeypatch.setattr(encoder, "find_ffmpeg", lambda: None)
+
+    class FakeStdin:
+        def __init__(self) -> None:
+            self.chunks = []
+
+        def write(self, data) -> None:
+            self.chunks.append(bytes(data))
+
+        def close(self) -> None:
+            pass
+
+    class FakeProc:
+        def __init__(self) -> None:
+            self.stdin = FakeStdin()
+
+        def poll(self):
+            return None
+
+    writer = encoder.FfmpegPipeWriter(tmp_path / "x.mp4", 30, (2, 2), "h264_nvenc")
+    writer._proc = FakeProc()
+    block = np.arange(3 * 2 * 2 * 3, dtype=np.uint8).reshape(3, 2, 2, 3)
+    writer.write_frames(block)
+    assert writer._proc.stdin.chunks == [block.tobytes()]
@@ -44,3 +44,9 @@ def test_format_timestamp_relative_days():
     now = datetime(2025, 12, 10, 15, 0, 0)
     ts_4d = datetime(2025, 12, 6, 10, 0, 0)
     assert format_timestamp_relative(ts_4d, now=now) == "4pv sitten"
+
+
+def test_format_bytes_unit_boundaries_and_cap():
+    assert format_bytes(1024 ** 2 - 1) == "1024 KB"
+    assert format_bytes(int(1.5 * 1024 ** 3)) == "1.5 GB"
+    assert format_bytes(2048 * 1024 ** 4) == "2048 TB"
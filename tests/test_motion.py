@@ -0,0 +1,39 @@
+"""Tests for the scene-change gate."""
+
+import numpy as np
+
+from src.core.motion import ChangeGate
+
+
+def _gray(value: int) -> np.ndarray:
+    return np.full((240, 320), value, dtype=np.uint8)
+
+
+def test_static_scene_is_skipped_until_refresh():
+    gate = ChangeGate(refresh_every=5)
+    decisions = [gate.should_analyse(_gray(100)) for _ in range(10)]
+    assert decisions == [True, False, False, False, False, True, False, False, False, False]
+
+
+def test_change_opens_gate():
+    gate = ChangeGate()
+    assert gate.should_analyse(_gray(100))
+    assert not gate.should_analyse(_gray(100))
+    frame = _gray(100)
+    frame[:60, :80] = 255
+    assert gate.should_analyse(frame)
+
+
+def test_slow_drift_accumulates_against_reference():
+    gate = ChangeGate(threshold=1024 * 3, refresh_every=1000)
+    assert gate.should_analyse(_gray(100))
+    opened = [gate.should_analyse(_gray(100 + step)) for step in range(1, 5)]
+    # Each step is only 1 level apart, but the third step is 3 levels from the reference
+    assert opened == [False, False, True, False]
+
+
+def test_reset_forces_analysis():
+    gate = ChangeGate()
+    gate.should_analyse(_gray(10))
+    gate.reset()
+    assert gate.should_analyse(_gray(10))
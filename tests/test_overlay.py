@@ -0,0 +1,130 @@
+"""Tests for logo overlay geometry and blending."""
+
+import numpy as np
+import pytest
+
+from src.utils.overlay import LOGO_MARGIN_PX, blend_logo, blend_weighted, fit_logo, logo_weights
+
+
+def _logo(h: int = 20, w: int = 40, alpha: int = 255) -> np.ndarray:
+    logo = np.zeros((h, w, 4), dtype=np.uint8)
+    logo[..., :3] = 200
+    logo[..., 3] = alpha
+    return logo
+
+
+def test_fit_logo_anchors_top_right():
+    fit = fit_logo(_logo(), (360, 640))
+    assert fit is not None
+    rows, cols = fit.roi
+    assert rows.start == LOGO_MARGIN_PX
+    assert cols.stop == 640 - LOGO_MARGIN_PX
+    assert fit.bgr.shape[:2] == fit.alpha.shape[:2]
+    assert fit.frame_size == (360, 640)
+
+
+def test_fit_logo_rejects_too_small_frame():
+    assert fit_logo(_logo(), (10, 30)) is None
+
+
+def test_blend_logo_only_touches_roi():
+    frame = np.zeros((360, 640, 3), dtype=np.uint8)
+    fit = fit_logo(_logo(), (360, 640))
+    blend_logo(frame, fit, 1.0)
+    assert np.all(frame[fit.roi] == 200)
+    assert frame[0, 0].sum() == 0
+
+
+def test_blend_logo_zero_opacity_keeps_frame():
+    frame = np.full((360, 640, 3), 50, dtype=np.uint8)
+    fit = fit_logo(_logo(), (360, 640))
+    blend_logo(frame, fit, 0.0)
+    assert np.all(frame == 50)
+
+
+def test_blend_logo_matches_float_reference():
+    rng = np.random.default_rng(0)
+    logo = rng.integers(0, 256, size=(20, 40, 4), dtype=np.uint8)
+    frame = rng.integers(0, 256, size=(360, 640, 3), dtype=np.uint8)
+    fit = fit_logo(logo, (360, 640))
+    alpha = fit.alpha.astype(np.float32) / 255.0 * 0.6
+    expected = alpha * fit.bgr + (1.0 - alpha) * frame[fit.roi]
+    blend_logo(frame, fit, 0.6)
+    assert np.abs(frame[fit.roi].astype(np.float32) - expected).max() <= 2.0
+
+
+def test_blend_weighted_matches_blend_logo():
+    fit = fit_logo(_logo(alpha=128), (360, 640))
+    a = np.full((360, 640, 3), 30, dtype=np.uint8)
+    b = a.copy()
+    blend_logo(a, fit, 0.4)
+    blend_weighted(b, fit, logo_weights(fit, 0.4))
+    assert np.array_equal(a, b)
+
+
+def test_jit_blend_matches_numpy_expression():
+    pytest.importorskip("numba")
+    from src.utils import overlay
+
+    rng = np.random.default_rng(1)
+    fit = fit_logo(rng.integers(0, 256, size=(20, 40, 4), dtype=np.uint8), (360, 640))
+    weights = logo_weights(fit, 0.7)
+    frame = rng.integers(0, 256, size=(360, 640, 3), dtype=np.uint8)
+    roi = frame[fit.roi].astype(np.uint16)
+    expected = ((fit.bgr * weights + roi * (256 - weights)) >> 8).astype(np.uint8)
+    overlay.blend_weighted(frame, fit, weights)
+    assert np.array_equal(frame[fit.roi], expected)
+
+
+def test_jit_blend_survives_concurrent_callers_on_workqueue_layer():
+    pytest.importorskip("numba")
+    import os
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    script = (
+        "import threading, numpy as np\n"
+        "from src.utils.overlay import fit_logo, logo_weights, blend_weighted\n"
+        "fit = fit_logo(np.full((20, 40, 4), 200, np.uint8), (360, 640))\n"
+        "w = logo_weights(fit, 0.5)\n"
+        "def run():\n"
+        "    frame = np.zeros((360, 640, 3), np.uint8)\n"
+        "    for _ in range(300):\n"
+        "        blend_weighted(frame, fit, w)\n"
+        "threads = [threading.Thread(target=run) for _ in range(2)]\n"
+        "[t.start() for t in threads]; [t.join() for t in threads]\n"
+    )
+    env = dict(os.environ, NUMBA_THREADING_LAYER="workqueue")
+    root = Path(__file__).resolve().parents[1]
+    result = subprocess.run([sys.executable, "-c", script], cwd=root, env=env, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+
+
+def test_warm_up_compiles_the_signature_live_frames_use():
+    pytest.importorskip("numba")
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    # Fresh interpreter so earlier tests haven't compiled anything yet
+    script = (
+        "import numpy as np\n"
+        "from src.utils import overlay\n"
+        "overlay.warm_up_blend()\n"
+        "before = len(overlay._blend_kernel.signatures)\n"
+        "fit = overlay.fit_logo(np.full((20, 40, 4), 200, np.uint8), (360, 640))\n"
+        "overlay.blend_logo(np.zeros((360, 640, 3), np.uint8), fit, 0.5)\n"
+        "assert len(overlay._blend_kernel.signatures) == before == 1, overlay._blend_kernel.signatures\n"
+    )
+    root = Path(__file__).resolve().parents[1]
+    result = subprocess.run([sys.executable, "-c", script], cwd=root, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+
+
+def test_jit_blend_releases_the_gil():
+    pytest.importorskip("numba")
+    from src.utils import overlay
+
+    # Both frame workers blend at once; holding the GIL would serialise them
+    assert overlay._blend_kernel.targetoptions.get("nogil") is True
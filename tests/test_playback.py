@@ -0,0 +1,166 @@
+"""Tests for the background playback decoder."""
+
+import threading
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from src.services.playback import EOF, PLAYBACK_QUEUE_SIZE, PlaybackReader, fit_size, plan_resize, prepare_frame, to_ppm
+
+
+class FakeFileCapture:
+    def __init__(self, frames: int, shape=(40, 80, 3)) -> None:
+        self.remaining = frames
+        self.shape = shape
+        self.reads = 0
+        self.released = threading.Event()
+
+    def isOpened(self) -> bool:
+        return not self.released.is_set()
+
+    def read(self):
+        if self.remaining <= 0:
+            return False, None
+        self.remaining -= 1
+        self.reads += 1
+        frame = np.zeros(self.shape, dtype=np.uint8)
+        frame[..., 0] = self.reads  # blue channel carries the frame number
+        return True, frame
+
+    def release(self) -> None:
+        self.released.set()
+
+
+def _drain(reader: PlaybackReader, timeout: float = 2.0):
+    items = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        item = reader.next_frame()
+        if item is None:
+            time.sleep(0.002)
+            continue
+        items.append(item)
+        if item is EOF:
+            break
+    return items
+
+
+def test_fit_size_never_upscales():
+    assert fit_size(640, 480, 320, 480) == (320, 240)
+    assert fit_size(100, 50, 960, 540) == (100, 50)
+
+
+def test_prepare_frame_resizes_and_converts():
+    frame = np.zeros((40, 80, 3), dtype=np.uint8)
+    frame[..., 0] = 200
+    rgb = prepare_frame(frame, (40, 40))
+    assert rgb.shape == (20, 40, 3)
+    assert rgb[0, 0].tolist() == [0, 0, 200]
+
+
+def test_reader_yields_frames_in_order_then_eof():
+    cap = FakeFileCapture(5)
+    reader = PlaybackReader(cap, target_size=(40, 40))
+    try:
+        items = _drain(reader)
+        assert items[-1] is EOF
+        frames = items[:-1]
+        assert [int(f.bgr[0, 0, 0]) for f in frames] == [1, 2, 3, 4, 5]
+        assert all(f.ppm.startswith(b"P6\n40 20\n255\n") for f in frames)
+        assert cap.released.wait(1.0)
+    finally:
+        reader.release()
+
+
+def test_reader_stays_bounded_and_releases_while_blocked():
+    cap = FakeFileCapture(1000)
+    reader = PlaybackReader(cap)
+    time.sleep(0.1)
+    # Decoder blocks once the queue is full instead of racing ahead
+    assert cap.reads <= PLAYBACK_QUEUE_SIZE + 1
+    reader.release()
+    assert cap.released.wait(1.0)
+    assert not reader.isOpened()
+
+
+def test_to_ppm_header_and_payload():
+    rgb = np.arange(2 * 3 * 3, dtype=np.uint8).reshape(2, 3, 3)
+    ppm = to_ppm(rgb[:, ::-1])  # non-contiguous views are packed first
+    header = b"P6\n3 2\n255\n"
+    assert ppm.startswith(header)
+    assert ppm[len(header):] == rgb[:, ::-1].tobytes()
+
+
+def test_jit_downscale_matches_opencv():
+    pytest.importorskip("numba")
+    rng = np.random.default_rng(3)
+    frame = rng.integers(0, 256, size=(72, 128, 3), dtype=np.uint8)
+    out = np.empty((36, 64, 3), dtype=np.uint8)
+    rgb = prepare_frame(frame, (64, 36), out)
+    assert rgb is out
+    expected = cv2.cvtColor(cv2.resize(frame, (64, 36), interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2RGB)
+    assert np.abs(rgb.astype(int) - expected.astype(int)).max() <= 1
+
+
+def test_plan_resize_picks_pyramid_for_exact_halving():
+    assert plan_resize(1920, 1080, 960, 540) == ((960, 540), 2, 1)
+    assert plan_resize(1920, 1080, 480, 270).pyr_levels == 2
+    assert plan_resize(1280, 720, 960, 540) == ((960, 540), 0, 0)
+    assert plan_resize(640, 360, 960, 540) == ((640, 360), 0, 0)
+
+
+def test_pyramid_path_without_numba(monkeypatch):
+    import src.services.playback as playback
+
+    monkeypatch.setattr(playback, "_bgr2rgb_area", None)
+    frame = np.zeros((72, 128, 3), dtype=np.uint8)
+    frame[..., 2] = 90
+    rgb = prepare_frame(frame, (32, 18))
+    assert rgb.shape == (18, 32, 3)
+    assert rgb[5, 5].tolist() == [90, 0, 0]
+
+
+def test_jit_downscale_survives_concurrent_callers_on_workqueue_layer():
+    pytest.importorskip("numba")
+    import os
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    script = (
+        "import threading, numpy as np\n"
+        "from src.services.playback import prepare_frame\n"
+        "def run():\n"
+        "    frame = np.zeros((72, 128, 3), np.uint8)\n"
+        "    for _ in range(300):\n"
+        "        prepare_frame(frame, (64, 36))\n"
+        "threads = [threading.Thread(target=run) for _ in range(2)]\n"
+        "[t.start() for t in threads]; [t.join() for t in threads]\n"
+    )
+    env = dict(os.environ, NUMBA_THREADING_LAYER="workqueue")
+    root = Path(__file__).resolve().parents[1]
+    result = subprocess.run([sys.executable, "-c", script], cwd=root, env=env, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+
+
+def test_warm_up_compiles_the_signature_playback_uses():
+    pytest.importorskip("numba")
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    # Fresh interpreter so earlier tests haven't compiled anything yet
+    script = (
+        "import numpy as np\n"
+        "from src.services import playback\n"
+        "playback.warm_up_resize()\n"
+        "before = len(playback._bgr2rgb_area.signatures)\n"
+        "playback.prepare_frame(np.zeros((72, 128, 3), np.uint8), (64, 36))\n"
+        "assert len(playback._bgr2rgb_area.signatures) == before == 1, playback._bgr2rgb_area.signatures\n"
+        "assert playback._bgr2rgb_area.targetoptions.get('nogil') is True\n"
+    )
+    root = Path(__file__).resolve().parents[1]
+    result = subprocess.run([sys.executable, "-c", script], cwd=root, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
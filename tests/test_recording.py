@@ -0,0 +1,315 @@
+"""Tests for the rolling motion-triggered recorder."""
+
+import threading
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+import pytest
+
+from src.services import recording
+from src.services.recording import RecorderConfig, RollingRecorder
+
+
+class FakeClock:
+    """Stands in for the time module; each frame is one frame interval later."""
+
+    def __init__(self) -> None:
+        self.now = 1_700_000_000.0
+        self.step = 1.0 / 30
+
+    def monotonic(self) -> float:
+        self.now += self.step
+        return self.now
+
+    def strftime(self, fmt: str) -> str:
+        return "20240101_000000"
+
+
+CLOCK = FakeClock()
+
+
+@pytest.fixture(autouse=True)
+def _fake_clock(monkeypatch):
+    CLOCK.__init__()
+    monkeypatch.setattr(recording, "time", CLOCK)
+
+
+class FakeWriter:
+    def __init__(self) -> None:
+        self.frames: List[np.ndarray] = []
+        self.released = False
+
+    def isOpened(self) -> bool:
+        return True
+
+    def write(self, frame: np.ndarray) -> None:
+        self.frames.append(frame)
+
+    def release(self) -> None:
+        self.released = True
+
+
+def _make_recorder(tmp_path: Path, **overrides) -> Tuple[RollingRecorder, List[FakeWriter]]:
+    writers: List[FakeWriter] = []
+
+    def factory(_size):
+        writer = FakeWriter()
+        writers.append(writer)
+        return writer
+
+    config = RecorderConfig(out_dir=tmp_path, cam_slot=0, **overrides)
+    CLOCK.step = 1.0 / config.target_fps
+    return RollingRecorder(config, writer_factory=factory), writers
+
+
+def _frame(value: int) -> np.ndarray:
+    return np.full((4, 6, 3), value, dtype=np.uint8)
+
+
+def _wait_finished(recorder: RollingRecorder, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        finished = recorder.poll_finished()
+        if finished is not None:
+            return finished
+        time.sleep(0.01)
+    return None
+
+
+def test_motion_flushes_prebuffer_then_live_frames(tmp_path):
+    recorder, writers = _make_recorder(tmp_path)
+    for value in range(3):
+        recorder.update(_frame(value), motion_trigger=False, person_count=0)
+    new_event, finished = recorder.update(_frame(3), motion_trigger=True, person_count=2)
+    assert new_event is not None and finished is None
+    recorder.update(_frame(4), motion_trigger=False, person_count=0)
+    recorder.close()
+
+    assert len(writers) == 1
+    written = [int(frame[0, 0, 0]) for frame in writers[0].frames]
+    assert written == [0, 1, 2, 3, 4]
+    assert writers[0].released
+
+
+def test_recording_finishes_after_post_seconds(tmp_path):
+    recorder, writers = _make_recorder(tmp_path, post_seconds=0.0)
+    new_event, finished = recorder.update(_frame(1), motion_trigger=True, person_count=1)
+    assert new_event is not None
+    assert not recorder._recording
+
+    finished = finished or _wait_finished(recorder)
+    assert finished is not None and finished["persons_max"] == 1
+    assert writers[0].released
+
+
+def test_finishing_never_waits_for_the_writer(tmp_path):
+    release = threading.Event()
+
+    class SlowReleaseWriter(FakeWriter):
+        def write(self, frame):
+            self.frames.append(frame.copy())
+
+        def release(self):
+            release.wait(2.0)
+            super().release()
+
+    writers: List[FakeWriter] = []
+
+    def factory(_size):
+        writers.append(SlowReleaseWriter())
+        return writers[-1]
+
+    config = RecorderConfig(out_dir=tmp_path, cam_slot=0, post_seconds=0.0, pre_seconds=0.1, target_fps=10)
+    CLOCK.step = 1.0 / config.target_fps
+    recorder = RollingRecorder(config, writer_factory=factory)
+    started = time.monotonic()
+    _, finished = recorder.update(_frame(1), motion_trigger=True, person_count=0)
+    assert finished is None  # the file is not complete yet
+    # A new recording starts while the previous file is still being released
+    new_event, finished = recorder.update(_frame(2), motion_trigger=True, person_count=0)
+    assert new_event is not None and finished is None
+    for value in range(3, 30):
+        assert recorder.update(_frame(value), motion_trigger=False, person_count=0)[1] is None
+    assert time.monotonic() - started < 1.0
+
+    release.set()
+    assert _wait_finished(recorder) is not None
+    assert writers[0].released
+    recorder.close()
+    assert [int(frame[0, 0, 0]) for frame in writers[0].frames] == [1]
+    assert len(writers) >= 2 and all(w.released for w in writers)
+
+
+def test_live_frames_are_decoupled_from_caller_buffer(tmp_path):
+    recorder, writers = _make_recorder(tmp_path)
+    frame = _frame(7)
+    recorder.update(frame, motion_trigger=True, person_count=0)
+    frame[:] = 0
+    recorder.close()
+
+    assert all(int(f[0, 0, 0]) == 7 for f in writers[0].frames)
+
+
+def test_close_returns_when_the_writer_thread_died(tmp_path):
+    class FailingWriter(FakeWriter):
+        def write(self, frame):
+            raise RuntimeError("disk full")
+
+    config = RecorderConfig(out_dir=tmp_path, cam_slot=0, target_fps=1, post_seconds=60.0)
+    CLOCK.step = 1.0 / config.target_fps
+    recorder = RollingRecorder(config, writer_factory=lambda _size: FailingWriter())
+    recorder.update(_frame(0), motion_trigger=True, person_count=0)
+    job = recorder._job
+    assert job is not None and job.thread is not None
+    job.thread.join(2.0)
+    for value in range(1, 10):  # nothing drains the queue once the writer is dead
+        recorder.update(_frame(value), motion_trigger=True, person_count=0)
+    assert job.frames.full()
+
+    started = time.monotonic()
+    recorder.close()
+    assert time.monotonic() - started < 1.0
+
+
+def test_close_gives_up_on_a_hung_writer(tmp_path, monkeypatch, caplog):
+    release = threading.Event()
+
+    class HungWriter(FakeWriter):
+        def write(self, frame):
+            release.wait(5.0)
+
+    monkeypatch.setattr(recording, "WRITER_CLOSE_TIMEOUT_SECONDS", 0.2)
+    recorder = RollingRecorder(RecorderConfig(out_dir=tmp_path, cam_slot=0, target_fps=1), writer_factory=lambda _size: HungWriter())
+    CLOCK.step = 1.0
+    for value in range(10):
+        recorder.update(_frame(value), motion_trigger=True, person_count=0)
+    try:
+        started = time.monotonic()
+        recorder.close()
+        assert time.monotonic() - started < 2.0
+        assert "writer-close-timeout" in caplog.text
+    finally:
+        release.set()
+
+
+def test_writer_queue_holds_two_seconds_of_frames(tmp_path):
+    recorder, _writers = _make_recorder(tmp_path, target_fps=12)
+    recorder.update(_frame(1), motion_trigger=True, person_count=0)
+    try:
+        assert recorder._job is not None
+        assert recorder._job.frames.maxsize == 24
+    finally:
+        recorder.close()
+
+
+def test_prebuffer_lives_in_preallocated_ring(tmp_path):
+    recorder, writers = _make_recorder(tmp_path, pre_seconds=0.5, target_fps=6)
+    for value in range(5):
+        recorder.update(_frame(value), motion_trigger=False, person_count=0)
+    ring = recorder._ring
+    assert ring is not None and ring.shape == (3 + 12, 4, 6, 3)  # prebuffer + writer queue
+
+    recorder.update(_frame(5), motion_trigger=True, person_count=0)
+    assert recorder._ring is ring
+    for value in range(6, 10):
+        recorder.update(_frame(value), motion_trigger=False, person_count=0)
+    recorder.close()
+    written = [int(frame[0, 0, 0]) for frame in writers[0].frames]
+    assert written == [3, 4, 5, 6, 7, 8, 9]
+
+
+def test_stalled_writer_never_sees_reused_slots(tmp_path):
+    release = threading.Event()
+
+    class StallingWriter(FakeWriter):
+        def write(self, frame):
+            release.wait(2.0)
+            self.frames.append(frame.copy())
+
+    writer = StallingWriter()
+    config = RecorderConfig(out_dir=tmp_path, cam_slot=0, pre_seconds=1.5, target_fps=2)
+    CLOCK.step = 1.0 / config.target_fps
+    recorder = RollingRecorder(config, writer_factory=lambda _size: writer)
+    recorder.update(_frame(0), motion_trigger=False, person_count=0)
+    recorder.update(_frame(1), motion_trigger=False, person_count=0)
+    for value in range(2, 40):
+        recorder.update(_frame(value), motion_trigger=True, person_count=0)
+    release.set()
+    recorder.close()
+
+    written = [int(frame[0, 0, 0]) for frame in writer.frames]
+    assert written[:3] == [0, 1, 2]
+    assert written == sorted(written)  # a reused slot would surface a later frame early
+
+
+def test_prebuffer_larger_than_writer_queue_is_flushed_in_order(tmp_path):
+    recorder, writers = _make_recorder(tmp_path, pre_seconds=10.0, target_fps=1)
+    for value in range(8):
+        recorder.update(_frame(value), motion_trigger=False, person_count=0)
+    recorder.update(_frame(8), motion_trigger=True, person_count=0)
+    recorder.close()
+    assert [int(frame[0, 0, 0]) for frame in writers[0].frames] == list(range(9))
+
+
+def test_update_uses_caller_timestamp(tmp_path):
+    recorder, _writers = _make_recorder(tmp_path, post_seconds=2.0)
+    new_event, _ = recorder.update(_frame(1), motion_trigger=True, person_count=0, now=100.0)
+    assert new_event is not None
+    _, finished = recorder.update(_frame(2), motion_trigger=False, person_count=0, now=101.0)
+    assert finished is None
+    _, finished = recorder.update(_frame(3), motion_trigger=False, person_count=0, now=102.5)
+    finished = finished or _wait_finished(recorder)
+    assert finished is not None and finished["duration"] == 2.5
+    assert new_event["start"] <= finished["end"]
+
+
+def test_prebuffer_reaches_block_writers_as_ring_views(tmp_path):
+    class BlockWriter(FakeWriter):
+        def __init__(self) -> None:
+            super().__init__()
+            self.blocks = []
+
+        def write_frames(self, frames):
+            self.blocks.append(frames.shape[0])
+            self.frames.extend(frame.copy() for frame in frames)
+
+    writer = BlockWriter()
+    config = RecorderConfig(out_dir=tmp_path, cam_slot=0, pre_seconds=1.0, target_fps=4)
+    CLOCK.step = 1.0 / config.target_fps
+    recorder = RollingRecorder(config, writer_factory=lambda _size: writer)
+    for value in range(13):  # wraps the 4 + 8 slot ring
+        recorder.update(_frame(value), motion_trigger=False, person_count=0)
+    recorder.update(_frame(13), motion_trigger=True, person_count=0)
+    recorder.close()
+
+    assert sum(writer.blocks) == 3 and len(writer.blocks) <= 2
+    assert [int(frame[0, 0, 0]) for frame in writer.frames] == [10, 11, 12, 13]
+
+
+def test_live_frames_are_paced_to_target_fps(tmp_path):
+    recorder, writers = _make_recorder(tmp_path, pre_seconds=0.1, target_fps=10)
+    recorder.update(_frame(0), motion_trigger=True, person_count=0)
+    CLOCK.step = 0.02  # driver bursts at 50 fps
+    for value in range(1, 9):
+        recorder.update(_frame(value), motion_trigger=True, person_count=0)
+    recorder.close()
+    # One frame per 0.1 s slot, taken up to half a slot early
+    assert [int(frame[0, 0, 0]) for frame in writers[0].frames] == [0, 3, 8]
+
+
+def test_recorder_accepts_string_out_dir(tmp_path):
+    out_dir = tmp_path / "nested" / "recordings"
+    recorder = RollingRecorder(RecorderConfig(out_dir=str(out_dir), cam_slot=0))
+    assert out_dir.is_dir()
+    assert recorder._FOURCC == recording.cv2.VideoWriter_fourcc(*"MJPG")
+
+
+def test_prebuffer_flush_drops_frames_older_than_pre_seconds(tmp_path):
+    recorder, writers = _make_recorder(tmp_path, pre_seconds=1.0, target_fps=4)
+    for value, ts in enumerate([10.0, 10.1, 10.9, 11.2]):
+        recorder.update(_frame(value), motion_trigger=False, person_count=0, now=ts)
+    recorder.update(_frame(4), motion_trigger=True, person_count=0, now=11.5)
+    recorder.close()
+    assert [int(frame[0, 0, 0]) for frame in writers[0].frames] == [2, 3, 4]
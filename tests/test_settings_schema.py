@@ -0,0 +1,52 @@
+"""Tests for the settings validation table."""
+
+from src.core.settings_schema import format_errors, validate_settings
+
+
+def test_validate_settings_coerces_valid_payload():
+    clean, errors = validate_settings({
+        "storage_limit_gb": "7.5",
+        "logo_alpha": 0.3,
+        "motion_threshold": "0.05",
+        "audio_enabled": 1,
+        "audio_device": None,
+        "hotkeys": {},
+    })
+    assert errors == {}
+    assert clean["storage_limit_gb"] == 7.5
+    assert clean["motion_threshold"] == 0.05
+    assert clean["audio_enabled"] is True
+    assert clean["audio_device"] == ""
+
+
+def test_validate_settings_reports_every_bad_field():
+    clean, errors = validate_settings({
+        "storage_limit_gb": "abc",
+        "logo_alpha": 1.5,
+        "autoreconnect": "maybe",
+        "motion_threshold": 0.1,
+    })
+    assert set(errors) == {"storage_limit_gb", "logo_alpha", "autoreconnect"}
+    assert clean == {"motion_threshold": 0.1}
+
+
+def test_validate_settings_rejects_non_positive_limit_and_ignores_unknown_keys():
+    clean, errors = validate_settings({"storage_limit_gb": 0, "unknown": 1})
+    assert "storage_limit_gb" in errors
+    assert "unknown" not in clean
+
+
+def test_format_errors_uses_field_labels():
+    text = format_errors({"logo_alpha": "täytyy olla välillä 0–1"})
+    assert text == "Läpinäkyvyys: täytyy olla välillä 0–1"
+
+
+def test_defaults_roundtrip_through_diff():
+    from src.core.settings_schema import DEFAULT_SETTINGS, diff_from_defaults, with_defaults
+
+    changed = with_defaults({"logo_alpha": 0.5})
+    assert changed["storage_limit_gb"] == DEFAULT_SETTINGS["storage_limit_gb"]
+    assert diff_from_defaults(changed) == {"logo_alpha": 0.5}
+    # Mutating a merged copy must not leak into the shared defaults
+    changed["event_notes"]["x.avi"] = "note"
+    assert DEFAULT_SETTINGS["event_notes"] == {}
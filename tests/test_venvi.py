@@ -1,5 +1,7 @@
 from pathlib import Path
 
+import pytest
+
 import venvi
 
 
@@ -51,3 +53,78 @@ def test_run_node_service_skips_when_missing_package(tmp_path):
     paths = venvi.resolve_paths(project_root)
     venvi.ensure_virtualenv(paths)
     assert venvi.run_node_service(paths) is False
+
+
+def test_install_skips_pip_when_requirements_unchanged(tmp_path, monkeypatch):
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text("numpy\n")
+    paths = venvi.resolve_paths(tmp_path)
+    paths.venv_dir.mkdir()
+    calls = []
+    monkeypatch.setattr(venvi, "run_command", lambda command, **_kw: calls.append([str(c) for c in command]))
+
+    venvi.install_python_dependencies(paths, requirements)
+    assert len(calls) == 2  # tools upgrade + requirements
+
+    venvi.install_python_dependencies(paths, requirements)
+    assert len(calls) == 2
+
+    requirements.write_text("numpy\nopencv-python\n")
+    venvi.install_python_dependencies(paths, requirements)
+    assert len(calls) == 3
+    assert calls[-1][-2:] == ["-r", str(requirements)]
+
+
+def test_run_command_streams_output_lines(capsys):
+    script = "import sys; print('one'); print('two'); print('oops', file=sys.stderr)"
+    completed = venvi.run_command([venvi.sys.executable, "-c", script])
+    assert completed.returncode == 0
+    events = [venvi.json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    stdout_lines = [e["output"] for e in events if e["event"] == "command.stdout"]
+    assert stdout_lines == ["one", "two"]
+    assert {"event": "command.stderr", "output": "oops"} in events
+
+
+def test_run_command_raises_on_failure(capsys):
+    with pytest.raises(RuntimeError):
+        venvi.run_command([venvi.sys.executable, "-c", "raise SystemExit(3)"])
+    assert '"returncode": 3' in capsys.readouterr().out
+
+
+def test_main_overlaps_npm_install_with_tests(tmp_path, monkeypatch):
+    import argparse
+    import threading
+
+    events = []
+    install_started = threading.Event()
+    args = argparse.Namespace(
+        action="setup", with_npm=True, skip_tests=False, entrypoint="src.index",
+        requirements=str(tmp_path / "requirements.txt"), pytest_args=None,
+    )
+    monkeypatch.setattr(venvi, "parse_args", lambda: args)
+    monkeypatch.setattr(venvi, "ensure_virtualenv", lambda paths: None)
+    monkeypatch.setattr(venvi, "install_python_dependencies", lambda paths, req: None)
+
+    def fake_install(paths):
+        install_started.set()
+        events.append(("install", threading.current_thread() is threading.main_thread()))
+        return True
+
+    def fake_tests(paths, extra):
+        assert install_started.wait(2.0)  # install runs while tests are still going
+        events.append(("tests", threading.current_thread() is threading.main_thread()))
+
+    monkeypatch.setattr(venvi, "_npm_install", fake_install)
+    monkeypatch.setattr(venvi, "run_tests", fake_tests)
+    monkeypatch.setattr(venvi, "_npm_start", lambda paths: events.append(("start", True)))
+
+    assert venvi.main() == 0
+    assert events == [("install", False), ("tests", True), ("start", True)]
+
+
+def test_with_venv_env_is_cached_and_read_only(tmp_path):
+    paths = venvi.resolve_paths(tmp_path)
+    env = venvi.with_venv_env(paths)
+    assert venvi.with_venv_env(venvi.resolve_paths(tmp_path)) is env
+    with pytest.raises(TypeError):
+        env["PATH"] = "x"  # type: ignore[index]
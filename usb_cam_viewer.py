@@ -4,14 +4,26 @@ Why this design:
 - Preserve backwards compatibility with existing launch scripts.
 - Delegate to the new src.index main function for modularity.
 - Keep the script tiny for PyInstaller friendliness.
+- Import src.index lazily so early exits never pay for cv2, numpy or Tk.
 """
 
 from __future__ import annotations
 
-from src.index import main
+from typing import Any
 
 # AnomFIN — the neural network of innovation.
 
 
+def __getattr__(name: str) -> Any:
+    # PEP 562: keep ``usb_cam_viewer.main`` importable without eager loading
+    if name == "main":
+        from src.index import main
+
+        return main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 if __name__ == "__main__":
+    from src.index import main
+
     main()
@@ -5,23 +5,31 @@ optionally wire in Node services, and launch AnomRecorder in a repeatable way.
 - Functional helpers keep side-effects at the edge.
 - Structured logs make automation and troubleshooting predictable.
 - Guardrails ensure Python version/paths are validated before any install or launch.
+- Sentinel files in the venv skip pip entirely when nothing changed since the last install.
 
 AnomFIN — the neural network of innovation.
 """
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
+import functools
+import hashlib
 import json
 import os
 import subprocess
 import sys
+import threading
+import types
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Mapping
+from typing import IO, Iterable, Mapping
 
 PROJECT_ROOT = Path(__file__).resolve().parent
 DEFAULT_REQUIREMENTS = PROJECT_ROOT / "requirements.txt"
 MINIMUM_PYTHON = (3, 9)
+REQUIREMENTS_HASH_FILE = ".req_hash"
+TOOLS_MARKER_FILE = ".tools_ok"
 
 
 @dataclass(frozen=True)
@@ -69,33 +77,58 @@ def resolve_paths(project_root: Path, venv_dir: Path | None = None, platform_os:
     )
 
 
+@functools.lru_cache(maxsize=4)
 def with_venv_env(paths: VenvPaths) -> Mapping[str, str]:
+    """Environment for commands run inside the venv.
+
+    Built once per VenvPaths and returned read-only, since every caller shares it.
+    """
     env = os.environ.copy()
     path_prefix = str(paths.bin_dir)
     env_path = env.get("PATH", "")
     env["PATH"] = path_prefix + os.pathsep + env_path
     env.setdefault("VIRTUAL_ENV", str(paths.venv_dir))
-    return env
+    return types.MappingProxyType(env)
+
+
+def _pump(stream: IO[str], event: str) -> None:
+    with stream:
+        for line in stream:
+            line = line.rstrip()
+            if line:
+                log(event, output=line)
 
 
 def run_command(command: Iterable[str], *, cwd: Path | None = None, env: Mapping[str, str] | None = None) -> subprocess.CompletedProcess[str]:
+    """Run a command, logging its output line by line as it arrives.
+
+    Output is streamed rather than captured, so the returned CompletedProcess
+    carries only the return code.
+    """
     command_list = [str(part) for part in command]
     log("command.run", cmd=" ".join(command_list), cwd=str(cwd) if cwd else None)
-    completed = subprocess.run(command_list, cwd=cwd, env=env, text=True, capture_output=True)
-    if completed.returncode != 0:
-        log(
-            "command.error",
-            cmd=" ".join(command_list),
-            returncode=completed.returncode,
-            stdout=completed.stdout.strip(),
-            stderr=completed.stderr.strip(),
-        )
+    process = subprocess.Popen(
+        command_list,
+        cwd=cwd,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        bufsize=1,
+    )
+    pumps = [
+        threading.Thread(target=_pump, args=(process.stdout, "command.stdout"), daemon=True),
+        threading.Thread(target=_pump, args=(process.stderr, "command.stderr"), daemon=True),
+    ]
+    for pump in pumps:
+        pump.start()
+    returncode = process.wait()
+    for pump in pumps:
+        pump.join()
+    if returncode != 0:
+        log("command.error", cmd=" ".join(command_list), returncode=returncode)
         raise RuntimeError(f"Command failed: {' '.join(command_list)}")
-    if completed.stdout.strip():
-        log("command.stdout", output=completed.stdout.strip())
-    if completed.stderr.strip():
-        log("command.stderr", output=completed.stderr.strip())
-    return completed
+    return subprocess.CompletedProcess(command_list, returncode)
 
 
 def ensure_virtualenv(paths: VenvPaths) -> None:
@@ -112,11 +145,19 @@ def install_python_dependencies(paths: VenvPaths, requirements_file: Path = DEFA
         log("deps.missing", message=message)
         raise FileNotFoundError(message)
     env = with_venv_env(paths)
-    if upgrade_tools:
+    tools_marker = paths.venv_dir / TOOLS_MARKER_FILE
+    if upgrade_tools and not tools_marker.exists():
         log("deps.pip.upgrade")
         run_command([paths.python, "-m", "pip", "install", "--upgrade", "pip", "wheel", "setuptools"], env=env)
+        tools_marker.write_text("ok", encoding="utf-8")
+    digest = hashlib.sha256(requirements_file.read_bytes()).hexdigest()
+    sentinel = paths.venv_dir / REQUIREMENTS_HASH_FILE
+    if sentinel.exists() and sentinel.read_text(encoding="utf-8").strip() == digest:
+        log("deps.cache.hit", requirements=str(requirements_file))
+        return
     log("deps.install", requirements=str(requirements_file))
     run_command([paths.python, "-m", "pip", "install", "-r", str(requirements_file)], env=env)
+    sentinel.write_text(digest, encoding="utf-8")
 
 
 def run_tests(paths: VenvPaths, extra_args: list[str] | None = None) -> None:
@@ -127,16 +168,25 @@ def run_tests(paths: VenvPaths, extra_args: list[str] | None = None) -> None:
     run_command(pytest_cmd, cwd=paths.project_root, env=env)
 
 
-def run_node_service(paths: VenvPaths, script: str = "start") -> bool:
+def _npm_install(paths: VenvPaths) -> bool:
     package_json = paths.project_root / "package.json"
     if not package_json.exists():
         log("npm.skip", reason="package.json not found")
         return False
-    env = with_venv_env(paths)
     log("npm.install")
-    run_command([paths.npm_command, "install"], cwd=paths.project_root, env=env)
+    run_command([paths.npm_command, "install"], cwd=paths.project_root, env=with_venv_env(paths))
+    return True
+
+
+def _npm_start(paths: VenvPaths, script: str = "start") -> None:
     log("npm.start", script=script)
-    run_command([paths.npm_command, "run", script], cwd=paths.project_root, env=env)
+    run_command([paths.npm_command, "run", script], cwd=paths.project_root, env=with_venv_env(paths))
+
+
+def run_node_service(paths: VenvPaths, script: str = "start") -> bool:
+    if not _npm_install(paths):
+        return False
+    _npm_start(paths, script)
     return True
 
 
@@ -169,11 +219,15 @@ def main() -> int:
         run_tests(paths, args.pytest_args or [])
         return 0
 
-    if not args.skip_tests:
-        run_tests(paths, args.pytest_args or [])
+    # npm install doesn't touch the Python env, so overlap it with the test run
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        npm_future = pool.submit(_npm_install, paths) if args.with_npm else None
+        if not args.skip_tests:
+            run_tests(paths, args.pytest_args or [])
+        npm_ready = npm_future.result() if npm_future is not None else False
 
-    if args.with_npm:
-        run_node_service(paths)
+    if npm_ready:
+        _npm_start(paths)
 
     if args.action == "setup":
         log("setup.complete")